@@ -0,0 +1,79 @@
+"""Event loop lag during a burst of logins, with bcrypt inline vs. in the worker pool.
+
+Simulates N reviewers logging in at once (one bcrypt verification each) while
+a probe task measures how late the event loop wakes it up every 10 ms, i.e.
+how long every other request served by the process would stall.
+
+    uv run python benchmarks/login_event_loop_lag.py --logins 50
+
+Compare the max/p99 lag of the two runs; BCRYPT_ROUNDS and
+PASSWORD_HASH_WORKERS are read from the environment like in the app.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import bcrypt
+
+from aitrace.common import password_hashing
+from aitrace.common.settings import settings
+
+PROBE_INTERVAL = 0.01
+
+
+async def probe(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late each PROBE_INTERVAL sleep returns."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def verify_inline(password: str, hashed: str) -> bool:
+    """Verification as AuthService did it before: blocking the event loop."""
+    return bcrypt.checkpw(password.encode(), hashed.encode())
+
+
+async def run(name: str, verify, logins: int, password: str, hashed: str) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(PROBE_INTERVAL * 5)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(verify(password, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    assert all(results)
+
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{name:>8}: {logins} logins in {elapsed:.2f}s | event loop lag "
+        f"median {statistics.median(lags_ms):.1f} ms, p99 {p99:.1f} ms, max {lags_ms[-1]:.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=50, help="Concurrent logins")
+    args = parser.parse_args()
+
+    password = "correct horse battery staple"
+    hashed = await password_hashing.hash_password(password)
+    print(
+        f"BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS} "
+        f"PASSWORD_HASH_WORKERS={settings.PASSWORD_HASH_WORKERS}"
+    )
+
+    await run("inline", verify_inline, args.logins, password, hashed)
+    await run("pool", password_hashing.verify_password, args.logins, password, hashed)
+    password_hashing.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+"""Concurrent reviewers draining one dataset through review sessions.
+
+Creates a scratch team, dataset and pending rows, then runs N reviewers in
+parallel, each approving every row it is delivered, until the queue is
+empty. Checks that no row was delivered to two reviewers, that no approval
+conflicted and that every row ends up reviewed. The scratch data is deleted
+afterwards.
+
+Runs against the database configured in .env (POSTGRES_*), which must have
+the current schema (migration 0005):
+
+    uv run python benchmarks/review_leases.py --reviewers 20 --rows 5000
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, func, select
+
+from aitrace.common.database import get_db, session_wrapper
+from aitrace.models.dataset import Dataset
+from aitrace.models.row import (
+    DatasetRow,
+    ReviewAction,
+    ReviewDecision,
+    ReviewSessionRequest,
+)
+from aitrace.models.schema import Schema
+from aitrace.models.team import Team
+from aitrace.models.user import User
+from aitrace.repositories.row_repository import DatasetRowRepository
+from aitrace.services.row_service import RowService
+
+
+async def create_dataset(reviewers: int, rows: int) -> tuple[UUID, UUID, list[UUID]]:
+    """Create the scratch team, reviewers, dataset and pending rows."""
+    async with get_db() as db:
+        team = Team(id=uuid4(), name=f"lease-bench-{uuid4().hex[:8]}")
+        db.add(team)
+        await db.flush()
+
+        reviewer_ids = [uuid4() for _ in range(reviewers)]
+        db.add_all(
+            User(
+                id=reviewer_id,
+                email=f"{reviewer_id}@lease-bench.invalid",
+                password_hash="!",
+                role="user",
+                team_id=team.id,
+                must_reset_pwd=False,
+            )
+            for reviewer_id in reviewer_ids
+        )
+        schema = Schema(id=uuid4(), name="lease-bench", team_id=team.id)
+        db.add(schema)
+        await db.flush()
+
+        dataset = Dataset(id=uuid4(), name="lease-bench", team_id=team.id, schema_id=schema.id)
+        db.add(dataset)
+        await db.flush()
+
+        row_repo = DatasetRowRepository(db)
+        for start in range(0, rows, 1000):
+            await row_repo.insert_many(
+                [
+                    {
+                        "id": uuid4(),
+                        "dataset_id": dataset.id,
+                        "image_url": f"https://images.example.com/{n}.jpg",
+                        "image_hash": f"{n:032x}",
+                        "data": {},
+                        "status": "pending",
+                    }
+                    for n in range(start, min(start + 1000, rows))
+                ]
+            )
+
+    return team.id, dataset.id, reviewer_ids
+
+
+async def review(
+    dataset_id: UUID, reviewer_id: UUID, batch_size: int, delivered: list[UUID]
+) -> int:
+    """Approve every delivered row until the queue is exhausted; returns the conflicts."""
+    decisions: list[ReviewDecision] = []
+    continuation = None
+    conflicts = 0
+
+    while True:
+        async with get_db() as db:
+            response = await RowService(db).review_session(
+                dataset_id,
+                ReviewSessionRequest(
+                    decisions=decisions, limit=batch_size, continuation=continuation
+                ),
+                reviewer_id,
+            )
+        conflicts += len(response.conflicts)
+        if not response.rows:
+            return conflicts
+
+        delivered.extend(row.id for row in response.rows)
+        decisions = [
+            ReviewDecision(row_id=row.id, action=ReviewAction.APPROVE, data={"ok": True})
+            for row in response.rows
+        ]
+        continuation = response.continuation
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviewers", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=20)
+    args = parser.parse_args()
+
+    await session_wrapper.connect()
+    team_id, dataset_id, reviewer_ids = await create_dataset(args.reviewers, args.rows)
+    try:
+        delivered: dict[UUID, list[UUID]] = {reviewer_id: [] for reviewer_id in reviewer_ids}
+        start = time.perf_counter()
+        conflicts = await asyncio.gather(
+            *(
+                review(dataset_id, reviewer_id, args.batch_size, delivered[reviewer_id])
+                for reviewer_id in reviewer_ids
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+        deliveries = Counter(row_id for rows in delivered.values() for row_id in rows)
+        duplicates = sum(1 for count in deliveries.values() if count > 1)
+        async with get_db() as db:
+            pending = await db.scalar(
+                select(func.count()).where(
+                    DatasetRow.dataset_id == dataset_id, DatasetRow.status == "pending"
+                )
+            )
+
+        per_reviewer = sorted(len(rows) for rows in delivered.values())
+        print(
+            f"{args.reviewers} reviewers, {args.rows} rows: {elapsed:.2f}s "
+            f"({args.rows / elapsed:.0f} rows/s), rows per reviewer "
+            f"min {per_reviewer[0]} / max {per_reviewer[-1]}"
+        )
+        print(
+            f"delivered {len(deliveries)}, delivered twice {duplicates}, "
+            f"conflicts {sum(conflicts)}, still pending {pending}"
+        )
+        ok = duplicates == 0 and sum(conflicts) == 0 and pending == 0
+        print("OK" if ok else "FAILED")
+    finally:
+        async with get_db() as db:
+            await db.execute(delete(Dataset).where(Dataset.id == dataset_id))
+            await db.execute(delete(Team).where(Team.id == team_id))
+        await session_wrapper.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+-- Before/after query plans for the dataset_rows indexes (migration 0004).
+--
+-- Builds a scratch copy of dataset_rows in the aitrace_bench schema with
+-- 1.2M rows (20 datasets x 60k rows, 20% pending), runs the hot queries of
+-- DatasetRowRepository with the original indexes, swaps in the new ones and
+-- runs them again. Nothing in the aitrace schema is touched.
+--
+--   psql -h localhost -U postgres -d aitrace -f benchmarks/row_indexes.sql
+--
+-- Compare the "Execution Time" and "Buffers" lines of each pair of plans.
+
+\set ON_ERROR_STOP on
+\timing off
+
+DROP SCHEMA IF EXISTS aitrace_bench CASCADE;
+CREATE SCHEMA aitrace_bench;
+
+CREATE TABLE aitrace_bench.dataset_rows (
+    id UUID PRIMARY KEY,
+    dataset_id UUID NOT NULL,
+    image_url TEXT NOT NULL,
+    image_hash VARCHAR(32) NOT NULL,
+    data JSONB DEFAULT '{}',
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    created_by UUID,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_by UUID,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    UNIQUE(dataset_id, image_hash)
+);
+
+INSERT INTO aitrace_bench.dataset_rows (id, dataset_id, image_url, image_hash, data, status, created_at, updated_at)
+SELECT
+    gen_random_uuid(),
+    ('00000000-0000-0000-0000-' || lpad(to_hex(n % 20), 12, '0'))::uuid,
+    'https://images.example.com/' || n || '.jpg',
+    md5(n::text),
+    jsonb_build_object('label', n % 7, 'ok', n % 2 = 0),
+    CASE WHEN n % 5 = 0 THEN 'pending' ELSE 'reviewed' END,
+    ts,
+    ts
+FROM generate_series(1, 1200000) AS n,
+     LATERAL (SELECT NOW() - (n || ' seconds')::interval AS ts) AS t;
+
+-- Keyset position 20,000 rows deep into dataset 1
+SELECT updated_at AS deep_updated_at, id AS deep_id
+FROM aitrace_bench.dataset_rows
+WHERE dataset_id = '00000000-0000-0000-0000-000000000001'
+ORDER BY updated_at DESC, id DESC
+OFFSET 20000 LIMIT 1 \gset
+
+\set dataset '''00000000-0000-0000-0000-000000000001'''
+
+-- ---------------------------------------------------------------------------
+-- Before: indexes from the original schema.sql
+-- ---------------------------------------------------------------------------
+CREATE INDEX ON aitrace_bench.dataset_rows(dataset_id);
+CREATE INDEX ON aitrace_bench.dataset_rows(status);
+CREATE INDEX ON aitrace_bench.dataset_rows(image_hash);
+VACUUM ANALYZE aitrace_bench.dataset_rows;
+
+\echo '=== BEFORE: review queue, first page ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT * FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset AND status = 'pending'
+ORDER BY updated_at DESC, id DESC LIMIT 20;
+
+\echo '=== BEFORE: row list, page 1,000 (OFFSET) ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT * FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset
+ORDER BY updated_at DESC, id DESC OFFSET 20000 LIMIT 20;
+
+\echo '=== BEFORE: row list, page 1,000 (keyset) ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT * FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset
+  AND (updated_at, id) < (:'deep_updated_at', :'deep_id')
+ORDER BY updated_at DESC, id DESC LIMIT 20;
+
+\echo '=== BEFORE: pending count ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT count(*) FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset AND status = 'pending';
+
+\echo '=== BEFORE: reviewed export ordering ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT image_url, data, status, created_at, updated_at FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset AND status = 'reviewed'
+ORDER BY updated_at DESC;
+
+\echo '=== BEFORE: import duplicate check ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT image_hash FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset
+  AND image_hash IN (SELECT md5(n::text) FROM generate_series(1, 4000, 20) AS n);
+
+-- ---------------------------------------------------------------------------
+-- After: indexes from migration 0004
+-- ---------------------------------------------------------------------------
+DROP INDEX aitrace_bench.dataset_rows_dataset_id_idx;
+DROP INDEX aitrace_bench.dataset_rows_status_idx;
+DROP INDEX aitrace_bench.dataset_rows_image_hash_idx;
+CREATE INDEX ON aitrace_bench.dataset_rows(dataset_id, updated_at DESC, id DESC);
+CREATE INDEX ON aitrace_bench.dataset_rows(dataset_id, status, updated_at DESC, id DESC);
+CREATE INDEX ON aitrace_bench.dataset_rows(dataset_id, updated_at DESC, id DESC)
+    WHERE status = 'pending';
+VACUUM ANALYZE aitrace_bench.dataset_rows;
+
+\echo '=== AFTER: review queue, first page ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT * FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset AND status = 'pending'
+ORDER BY updated_at DESC, id DESC LIMIT 20;
+
+\echo '=== AFTER: row list, page 1,000 (OFFSET) ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT * FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset
+ORDER BY updated_at DESC, id DESC OFFSET 20000 LIMIT 20;
+
+\echo '=== AFTER: row list, page 1,000 (keyset) ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT * FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset
+  AND (updated_at, id) < (:'deep_updated_at', :'deep_id')
+ORDER BY updated_at DESC, id DESC LIMIT 20;
+
+\echo '=== AFTER: pending count ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT count(*) FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset AND status = 'pending';
+
+\echo '=== AFTER: reviewed export ordering ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT image_url, data, status, created_at, updated_at FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset AND status = 'reviewed'
+ORDER BY updated_at DESC;
+
+\echo '=== AFTER: import duplicate check ==='
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT image_hash FROM aitrace_bench.dataset_rows
+WHERE dataset_id = :dataset
+  AND image_hash IN (SELECT md5(n::text) FROM generate_series(1, 4000, 20) AS n);
+
+DROP SCHEMA aitrace_bench CASCADE;
@@ -0,0 +1,12 @@
+-- URL -> image hash cache, so re-imports skip downloading unchanged images
+
+CREATE TABLE IF NOT EXISTS aitrace.image_hash_cache (
+    url_sha256 VARCHAR(64) PRIMARY KEY,
+    url TEXT NOT NULL,
+    image_hash VARCHAR(32) NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_image_hash_cache_fetched_at ON aitrace.image_hash_cache(fetched_at);
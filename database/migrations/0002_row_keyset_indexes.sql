@@ -0,0 +1,9 @@
+-- Composite indexes matching the (updated_at, id) keyset used to page rows
+-- and the review queue. Built CONCURRENTLY so large tables stay writable;
+-- run outside a transaction (psql's default autocommit mode).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_dataset_rows_dataset_updated
+    ON aitrace.dataset_rows(dataset_id, updated_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_dataset_rows_dataset_status_updated
+    ON aitrace.dataset_rows(dataset_id, status, updated_at DESC, id DESC);
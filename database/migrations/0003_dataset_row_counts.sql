@@ -0,0 +1,89 @@
+-- migrate:no-transaction
+-- Per-dataset row counts maintained by triggers, so dataset listings do not
+-- COUNT(*) every dataset. Each statement commits on its own, so creating the
+-- triggers only locks dataset_rows briefly and the backfill scan takes no
+-- lock that blocks writers.
+
+-- Per-dataset row counts by status. Triggers on dataset_rows append signed
+-- deltas (no shared counter row for concurrent writers to queue on); readers
+-- SUM them, and aitrace.compact_dataset_row_counts() folds them together.
+CREATE TABLE IF NOT EXISTS aitrace.dataset_row_counts (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    dataset_id UUID NOT NULL REFERENCES aitrace.datasets(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL,
+    row_count BIGINT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_dataset_row_counts_dataset_status ON aitrace.dataset_row_counts(dataset_id, status) INCLUDE (row_count);
+
+-- Record row count deltas for a statement on dataset_rows
+CREATE OR REPLACE FUNCTION aitrace.record_dataset_row_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO aitrace.dataset_row_counts (dataset_id, status, row_count)
+        SELECT dataset_id, status, COUNT(*) FROM new_rows GROUP BY dataset_id, status;
+    ELSIF TG_OP = 'DELETE' THEN
+        -- The join skips datasets deleted by this statement (ON DELETE CASCADE)
+        INSERT INTO aitrace.dataset_row_counts (dataset_id, status, row_count)
+        SELECT r.dataset_id, r.status, -COUNT(*)
+        FROM old_rows r
+        JOIN aitrace.datasets d ON d.id = r.dataset_id
+        GROUP BY r.dataset_id, r.status;
+    ELSE
+        INSERT INTO aitrace.dataset_row_counts (dataset_id, status, row_count)
+        SELECT dataset_id, status, SUM(delta)
+        FROM (
+            SELECT dataset_id, status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT dataset_id, status, -1 AS delta FROM old_rows
+        ) AS changes
+        GROUP BY dataset_id, status
+        HAVING SUM(delta) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Fold the row count deltas into one row per (dataset_id, status)
+CREATE OR REPLACE FUNCTION aitrace.compact_dataset_row_counts()
+RETURNS void AS $$
+    WITH removed AS (
+        DELETE FROM aitrace.dataset_row_counts
+        RETURNING dataset_id, status, row_count
+    )
+    INSERT INTO aitrace.dataset_row_counts (dataset_id, status, row_count)
+    SELECT dataset_id, status, SUM(row_count)
+    FROM removed
+    GROUP BY dataset_id, status
+    HAVING SUM(row_count) <> 0;
+$$ LANGUAGE sql;
+
+-- Maintain dataset_row_counts
+CREATE OR REPLACE TRIGGER dataset_rows_count_insert AFTER INSERT ON aitrace.dataset_rows
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION aitrace.record_dataset_row_counts();
+
+CREATE OR REPLACE TRIGGER dataset_rows_count_update AFTER UPDATE ON aitrace.dataset_rows
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION aitrace.record_dataset_row_counts();
+
+CREATE OR REPLACE TRIGGER dataset_rows_count_delete AFTER DELETE ON aitrace.dataset_rows
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION aitrace.record_dataset_row_counts();
+
+-- Backfill: in one snapshot, rows changed after the triggers were created
+-- already have their deltas, so only the difference between the visible rows
+-- and the visible deltas is added. Re-running it adds nothing.
+INSERT INTO aitrace.dataset_row_counts (dataset_id, status, row_count)
+SELECT dataset_id, status, SUM(row_count)
+FROM (
+    SELECT dataset_id, status, COUNT(*) AS row_count
+    FROM aitrace.dataset_rows
+    GROUP BY dataset_id, status
+    UNION ALL
+    SELECT dataset_id, status, -row_count
+    FROM aitrace.dataset_row_counts
+) AS difference
+GROUP BY dataset_id, status
+HAVING SUM(row_count) <> 0;
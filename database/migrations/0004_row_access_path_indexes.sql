@@ -0,0 +1,22 @@
+-- Indexes for the hot dataset_rows access paths in DatasetRowRepository:
+--   review queue      dataset_id = ? AND status = 'pending' ORDER BY updated_at DESC, id DESC
+--   row list/export   dataset_id = ? [AND status = ?] ORDER BY updated_at DESC, id DESC
+--   duplicate checks  dataset_id = ? AND image_hash IN (...)  (UNIQUE constraint index)
+-- The review queue gets a partial index that only holds pending rows, so it
+-- stays small as datasets get reviewed. Single-column indexes that are
+-- covered by a UNIQUE constraint or by the composites are dropped.
+-- Everything runs CONCURRENTLY: run outside a transaction (psql's default).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_dataset_rows_pending
+    ON aitrace.dataset_rows(dataset_id, updated_at DESC, id DESC)
+    WHERE status = 'pending';
+
+-- Leading column of UNIQUE(dataset_id, image_hash) and of the composites
+DROP INDEX CONCURRENTLY IF EXISTS aitrace.idx_dataset_rows_dataset_id;
+-- Two values, never selective on its own
+DROP INDEX CONCURRENTLY IF EXISTS aitrace.idx_dataset_rows_status;
+-- Hashes are only looked up within a dataset, through UNIQUE(dataset_id, image_hash)
+DROP INDEX CONCURRENTLY IF EXISTS aitrace.idx_dataset_rows_image_hash;
+-- Duplicates of the users.email and sessions.token UNIQUE constraint indexes
+DROP INDEX CONCURRENTLY IF EXISTS aitrace.idx_users_email;
+DROP INDEX CONCURRENTLY IF EXISTS aitrace.idx_sessions_token;
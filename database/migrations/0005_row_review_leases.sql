@@ -0,0 +1,24 @@
+-- Review leases: a reviewer claims pending rows for a while
+-- (SELECT ... FOR UPDATE SKIP LOCKED), so concurrent reviewers of a dataset
+-- never get the same rows. Leases are released when the reviewer decides on a
+-- row or ends the session, and otherwise expire.
+--
+-- leased_by has no foreign key: adding a validated one would scan
+-- dataset_rows under lock, and a lease of a deleted user just expires.
+-- The index is built CONCURRENTLY: run outside a transaction (psql's default).
+
+ALTER TABLE aitrace.dataset_rows
+    ADD COLUMN IF NOT EXISTS leased_by UUID,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+
+-- Taking or releasing a lease is not a change of the row: only bump
+-- updated_at (the queue's sort key) when row content is written
+CREATE OR REPLACE TRIGGER update_dataset_rows_updated_at
+    BEFORE UPDATE OF dataset_id, image_url, image_hash, data, status, created_by, updated_by
+    ON aitrace.dataset_rows
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- A reviewer's leases, to renew and release them; only holds leased rows
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_dataset_rows_leased_by
+    ON aitrace.dataset_rows(leased_by, dataset_id)
+    WHERE leased_by IS NOT NULL;
@@ -0,0 +1,10 @@
+#!/bin/bash
+# Runs once when the primary's data directory is initialized (docker-entrypoint-initdb.d).
+# Creates the role the replica streams WAL with and allows it to connect.
+set -e
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-SQL
+    CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD '${REPLICATION_PASSWORD}';
+SQL
+
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,14 @@
+#!/bin/bash
+# Entrypoint of the replica container: clones the primary on first start,
+# then runs as a hot standby streaming from it.
+set -e
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until pg_basebackup -h "$PRIMARY_HOST" -U replicator -D "$PGDATA" -R -X stream -c fast; do
+        echo "Waiting for the primary..."
+        sleep 2
+    done
+    chmod 0700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on
@@ -93,22 +93,62 @@ CREATE TABLE aitrace.dataset_rows (
     created_at TIMESTAMP NOT NULL DEFAULT NOW(),
     updated_by UUID REFERENCES aitrace.users(id) ON DELETE SET NULL,
     updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    leased_by UUID,  -- Reviewer holding the row until lease_expires_at (no FK, see migration 0005)
+    lease_expires_at TIMESTAMP,
     UNIQUE(dataset_id, image_hash)
 );
 
+-- Per-dataset row counts by status. Triggers on dataset_rows append signed
+-- deltas (no shared counter row for concurrent writers to queue on); readers
+-- SUM them, and aitrace.compact_dataset_row_counts() folds them together.
+CREATE TABLE aitrace.dataset_row_counts (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    dataset_id UUID NOT NULL REFERENCES aitrace.datasets(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL,
+    row_count BIGINT NOT NULL
+);
+
+-- Image hash cache (URL -> content hash, shared by all datasets)
+CREATE TABLE aitrace.image_hash_cache (
+    url_sha256 VARCHAR(64) PRIMARY KEY,
+    url TEXT NOT NULL,
+    image_hash VARCHAR(32) NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Applied migrations (see aitrace.common.migrations)
+CREATE TABLE aitrace.schema_migrations (
+    version VARCHAR(20) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum VARCHAR(64),  -- NULL for versions included in schema.sql
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Every migration in database/migrations is already part of this schema
+INSERT INTO aitrace.schema_migrations (version, name) VALUES
+    ('0001', 'image_hash_cache'),
+    ('0002', 'row_keyset_indexes'),
+    ('0003', 'dataset_row_counts'),
+    ('0004', 'row_access_path_indexes'),
+    ('0005', 'row_review_leases');
+
 -- Indexes for better query performance
 CREATE INDEX idx_users_team_id ON aitrace.users(team_id);
-CREATE INDEX idx_users_email ON aitrace.users(email);
 CREATE INDEX idx_sessions_user_id ON aitrace.sessions(user_id);
-CREATE INDEX idx_sessions_token ON aitrace.sessions(token);
 CREATE INDEX idx_sessions_expires_at ON aitrace.sessions(expires_at);
 CREATE INDEX idx_schemas_team_id ON aitrace.schemas(team_id);
 CREATE INDEX idx_schema_fields_schema_id ON aitrace.schema_fields(schema_id);
 CREATE INDEX idx_datasets_team_id ON aitrace.datasets(team_id);
 CREATE INDEX idx_datasets_schema_id ON aitrace.datasets(schema_id);
-CREATE INDEX idx_dataset_rows_dataset_id ON aitrace.dataset_rows(dataset_id);
-CREATE INDEX idx_dataset_rows_status ON aitrace.dataset_rows(status);
-CREATE INDEX idx_dataset_rows_image_hash ON aitrace.dataset_rows(image_hash);
+-- dataset_rows lookups by (dataset_id, image_hash) use the UNIQUE constraint index
+CREATE INDEX idx_dataset_rows_dataset_updated ON aitrace.dataset_rows(dataset_id, updated_at DESC, id DESC);
+CREATE INDEX idx_dataset_rows_dataset_status_updated ON aitrace.dataset_rows(dataset_id, status, updated_at DESC, id DESC);
+CREATE INDEX idx_dataset_rows_pending ON aitrace.dataset_rows(dataset_id, updated_at DESC, id DESC) WHERE status = 'pending';
+CREATE INDEX idx_dataset_rows_leased_by ON aitrace.dataset_rows(leased_by, dataset_id) WHERE leased_by IS NOT NULL;
+CREATE INDEX idx_dataset_row_counts_dataset_status ON aitrace.dataset_row_counts(dataset_id, status) INCLUDE (row_count);
+CREATE INDEX idx_image_hash_cache_fetched_at ON aitrace.image_hash_cache(fetched_at);
 
 -- Updated at trigger function
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -135,5 +175,64 @@ CREATE TRIGGER update_schema_fields_updated_at BEFORE UPDATE ON aitrace.schema_f
 CREATE TRIGGER update_datasets_updated_at BEFORE UPDATE ON aitrace.datasets
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
-CREATE TRIGGER update_dataset_rows_updated_at BEFORE UPDATE ON aitrace.dataset_rows
+-- Review leases are not changes of the row and leave updated_at alone
+CREATE TRIGGER update_dataset_rows_updated_at
+    BEFORE UPDATE OF dataset_id, image_url, image_hash, data, status, created_by, updated_by
+    ON aitrace.dataset_rows
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Record row count deltas for a statement on dataset_rows
+CREATE OR REPLACE FUNCTION aitrace.record_dataset_row_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO aitrace.dataset_row_counts (dataset_id, status, row_count)
+        SELECT dataset_id, status, COUNT(*) FROM new_rows GROUP BY dataset_id, status;
+    ELSIF TG_OP = 'DELETE' THEN
+        -- The join skips datasets deleted by this statement (ON DELETE CASCADE)
+        INSERT INTO aitrace.dataset_row_counts (dataset_id, status, row_count)
+        SELECT r.dataset_id, r.status, -COUNT(*)
+        FROM old_rows r
+        JOIN aitrace.datasets d ON d.id = r.dataset_id
+        GROUP BY r.dataset_id, r.status;
+    ELSE
+        INSERT INTO aitrace.dataset_row_counts (dataset_id, status, row_count)
+        SELECT dataset_id, status, SUM(delta)
+        FROM (
+            SELECT dataset_id, status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT dataset_id, status, -1 AS delta FROM old_rows
+        ) AS changes
+        GROUP BY dataset_id, status
+        HAVING SUM(delta) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Fold the row count deltas into one row per (dataset_id, status)
+CREATE OR REPLACE FUNCTION aitrace.compact_dataset_row_counts()
+RETURNS void AS $$
+    WITH removed AS (
+        DELETE FROM aitrace.dataset_row_counts
+        RETURNING dataset_id, status, row_count
+    )
+    INSERT INTO aitrace.dataset_row_counts (dataset_id, status, row_count)
+    SELECT dataset_id, status, SUM(row_count)
+    FROM removed
+    GROUP BY dataset_id, status
+    HAVING SUM(row_count) <> 0;
+$$ LANGUAGE sql;
+
+-- Maintain dataset_row_counts
+CREATE TRIGGER dataset_rows_count_insert AFTER INSERT ON aitrace.dataset_rows
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION aitrace.record_dataset_row_counts();
+
+CREATE TRIGGER dataset_rows_count_update AFTER UPDATE ON aitrace.dataset_rows
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION aitrace.record_dataset_row_counts();
+
+CREATE TRIGGER dataset_rows_count_delete AFTER DELETE ON aitrace.dataset_rows
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION aitrace.record_dataset_row_counts();
@@ -1,5 +1,13 @@
 import { api } from './api'
-import type { DatasetRow, CreateRowRequest, CSVImportRequest, CSVImportResponse, PaginatedResponse } from '@/types'
+import type {
+  DatasetRow,
+  CreateRowRequest,
+  CSVImportRequest,
+  CSVImportResponse,
+  PaginatedResponse,
+  ReviewSessionRequest,
+  ReviewSessionResponse,
+} from '@/types'
 
 export const rowService = {
   async list(datasetId: string, page = 1, pageSize = 20, status?: string): Promise<PaginatedResponse<DatasetRow>> {
@@ -12,6 +20,10 @@ export const rowService = {
     return api.get<PaginatedResponse<DatasetRow>>(`/datasets/${datasetId}/rows/queue`, { page, page_size: pageSize })
   },
 
+  async reviewSession(datasetId: string, data: ReviewSessionRequest): Promise<ReviewSessionResponse> {
+    return api.post<ReviewSessionResponse>(`/datasets/${datasetId}/rows/review-session`, data)
+  },
+
   async get(datasetId: string, rowId: string): Promise<DatasetRow> {
     return api.get<DatasetRow>(`/datasets/${datasetId}/rows/${rowId}`)
   },
@@ -40,6 +52,10 @@ export const rowService = {
     return api.post<CSVImportResponse>(`/datasets/${datasetId}/rows/import`, data)
   },
 
+  thumbnailUrl(datasetId: string, rowId: string, size = 256): string {
+    return `/api/v1/datasets/${datasetId}/rows/${rowId}/thumbnail?size=${size}`
+  },
+
   async exportCSV(datasetId: string, onlyReviewed: boolean = true): Promise<Blob> {
     const params = new URLSearchParams({ only_reviewed: String(onlyReviewed) })
     const response = await fetch(`/api/v1/datasets/${datasetId}/rows/export?${params}`, {
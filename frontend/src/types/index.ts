@@ -90,6 +90,7 @@ export interface Dataset {
   updated_at: string
   rows_count: number
   pending_count: number
+  status_counts: Record<string, number>
 }
 
 export interface CreateDatasetRequest {
@@ -116,6 +117,28 @@ export interface DatasetRow {
   updated_at: string
 }
 
+export type ReviewAction = 'approve' | 'skip' | 'delete'
+
+export interface ReviewDecision {
+  row_id: string
+  action: ReviewAction
+  data?: Record<string, any> | null
+}
+
+export interface ReviewSessionRequest {
+  decisions?: ReviewDecision[]
+  limit?: number
+  continuation?: string | null
+  release?: boolean
+}
+
+export interface ReviewSessionResponse {
+  rows: DatasetRow[]
+  continuation: string | null
+  pending_count: number
+  conflicts: string[]
+}
+
 export interface CreateRowRequest {
   image_url: string
   data: Record<string, any>
@@ -0,0 +1,116 @@
+"""In-process caches."""
+
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aitrace.common.settings import settings
+from aitrace.models.user import UserResponse
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded cache whose entries expire after a fixed TTL.
+
+    When full, the least recently used entry is evicted. Not thread-safe;
+    meant to be used from the event loop only.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries (0 disables the cache)
+            ttl_seconds: Seconds an entry stays valid
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        """
+        Cache a value.
+
+        Args:
+            key: Cache key
+            value: Value
+            ttl_seconds: Seconds this entry stays valid, if shorter than the cache's TTL
+        """
+        if self.max_size <= 0:
+            return
+
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """
+        Remove a cached value.
+
+        Args:
+            key: Cache key
+        """
+        self._entries.pop(key, None)
+
+    def invalidate_after_commit(self, key: K, db: AsyncSession) -> None:
+        """
+        Remove a cached value once the session's transaction commits.
+
+        Invalidating before the commit would let a concurrent request cache the
+        old value again, from a read made before the change became visible.
+
+        Args:
+            key: Cache key
+            db: Session whose transaction changes the value
+        """
+        event.listen(db.sync_session, "after_commit", lambda _: self.invalidate(key), once=True)
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        self._entries.clear()
+
+
+# Authenticated users by ID, see dependencies.get_current_user
+user_cache: TTLCache[UUID, UserResponse] = TTLCache(
+    settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS
+)
+
+# Verified access tokens: SHA-256 digest -> user ID, until the token expires
+token_cache: TTLCache[str, UUID] = TTLCache(
+    settings.TOKEN_CACHE_MAX_SIZE, settings.TOKEN_CACHE_MAX_TTL_SECONDS
+)
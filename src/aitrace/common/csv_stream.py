@@ -0,0 +1,275 @@
+"""Incremental CSV parsing for streamed uploads."""
+
+import codecs
+import csv
+import re
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+
+from fastapi import Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from aitrace.common.exceptions import ValidationException
+
+_LINE_END = re.compile(r"\r\n|\n|\r")
+
+
+def _ends_in_quoted_field(line: str, in_quoted: bool) -> bool:
+    """
+    Check whether a line ends inside a quoted field, following the csv module's rules.
+
+    A quote only opens a quoted field at the start of a field; inside one, a
+    doubled quote is an escaped quote and a single quote closes the field.
+
+    Args:
+        line: Line, with its line terminator
+        in_quoted: Whether the line starts inside a quoted field
+
+    Returns:
+        True if the record continues on the next line
+    """
+    if not in_quoted and '"' not in line:
+        return False
+
+    at_field_start = not in_quoted
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if in_quoted:
+            if char == '"':
+                if line.startswith('"', i + 1):
+                    i += 1  # Escaped quote
+                else:
+                    in_quoted = False
+        elif char == '"' and at_field_start:
+            in_quoted = True
+        at_field_start = not in_quoted and char == ","
+        i += 1
+
+    return in_quoted
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict[str, str | None]]:
+    """
+    Parse CSV records from a stream of UTF-8 bytes as they arrive.
+
+    Records follow csv.DictReader semantics: the first record is the header,
+    blank lines are skipped and missing trailing values are None. Quoted fields
+    may span lines and chunk boundaries. Records are limited to
+    csv.field_size_limit() characters, so neither an unclosed quote nor a
+    missing line break can buffer the rest of the upload.
+
+    Args:
+        chunks: Raw CSV bytes
+
+    Yields:
+        Records keyed by header column
+
+    Raises:
+        ValidationException: If the CSV is malformed or not UTF-8
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    header: list[str] | None = None
+    buffer = ""
+    record = ""
+    in_quoted = False
+
+    def decode(chunk: bytes, final: bool) -> str:
+        try:
+            return decoder.decode(chunk, final=final)
+        except UnicodeDecodeError as e:
+            raise ValidationException("CSV file must be UTF-8 encoded", details=str(e)) from e
+
+    def complete_lines(final: bool) -> Iterable[str]:
+        nonlocal buffer
+        start = 0
+        for match in _LINE_END.finditer(buffer):
+            # A trailing CR may be the first half of a CRLF split across chunks
+            if not final and match.group() == "\r" and match.end() == len(buffer):
+                break
+            yield buffer[start : match.end()]
+            start = match.end()
+        buffer = buffer[start:]
+        if final and buffer:
+            yield buffer
+            buffer = ""
+
+    def parse(lines: Iterable[str]) -> Iterable[list[str]]:
+        nonlocal record, in_quoted
+        for line in lines:
+            record += line
+            in_quoted = _ends_in_quoted_field(line, in_quoted)
+            if in_quoted:
+                # Inside a quoted field, the record continues on the next line
+                if len(record) > csv.field_size_limit():
+                    raise ValidationException(
+                        "CSV record is too long", details="Check for an unclosed quote"
+                    )
+                continue
+
+            try:
+                row = next(csv.reader([record]), [])
+            except csv.Error as e:
+                raise ValidationException(f"Invalid CSV: {str(e)}") from e
+            record = ""
+            if row:
+                yield row
+
+    def to_records(rows: Iterable[list[str]]) -> Iterable[dict[str, str | None]]:
+        nonlocal header
+        for row in rows:
+            if header is None:
+                header = row
+                continue
+
+            values: dict[str, str | None] = dict(zip(header, row))
+            for column in header[len(row) :]:
+                values[column] = None
+            yield values
+
+    async for chunk in chunks:
+        buffer += decode(chunk, final=False)
+        for values in to_records(parse(complete_lines(final=False))):
+            yield values
+
+        # Without a line break, the pending line would grow with every chunk
+        if len(record) + len(buffer) > csv.field_size_limit():
+            raise ValidationException(
+                "CSV record is too long", details="Check for a missing line break"
+            )
+
+    buffer += decode(b"", final=True)
+    for values in to_records(parse(complete_lines(final=True))):
+        yield values
+
+    if record:
+        raise ValidationException("CSV ends inside a quoted field")
+
+
+class MultipartCSVUpload:
+    """Streaming reader for a multipart/form-data request carrying one CSV file.
+
+    Form fields sent before the file part are collected; the file part is then
+    handed out chunk by chunk as the request body arrives, so memory stays
+    bounded by the network chunk size.
+    """
+
+    def __init__(self, request: Request, file_field: str = "file") -> None:
+        """
+        Initialize multipart CSV upload.
+
+        Args:
+            request: FastAPI request
+            file_field: Name of the form field carrying the CSV file
+
+        Raises:
+            ValidationException: If the request is not multipart/form-data
+        """
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise ValidationException("Expected a multipart/form-data upload")
+
+        self.fields: dict[str, str] = {}
+        self._file_field = file_field
+        self._body = request.stream().__aiter__()
+        self._file_chunks: deque[bytes] = deque()
+        self._file_started = False
+        self._file_done = False
+
+        self._part_name: str | None = None
+        self._part_value = bytearray()
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._part_headers: dict[bytes, bytes] = {}
+
+        self._parser = MultipartParser(
+            params[b"boundary"],
+            callbacks={
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            },
+        )
+
+    async def read_fields(self) -> dict[str, str]:
+        """
+        Read the request body up to the start of the file part.
+
+        Returns:
+            Form fields sent before the file
+
+        Raises:
+            ValidationException: If the request has no file part
+        """
+        while not self._file_started:
+            if not await self._feed():
+                raise ValidationException(f"Missing '{self._file_field}' file in upload")
+
+        return self.fields
+
+    async def file_chunks(self) -> AsyncIterator[bytes]:
+        """
+        Stream the content of the file part.
+
+        Yields:
+            File bytes, in order
+        """
+        while True:
+            while self._file_chunks:
+                yield self._file_chunks.popleft()
+
+            if self._file_done or not await self._feed():
+                return
+
+    async def _feed(self) -> bool:
+        """Feed the next body chunk to the parser; False once the body is exhausted."""
+        try:
+            chunk = await self._body.__anext__()
+        except StopAsyncIteration:
+            self._parser.finalize()
+            self._file_done = True
+            return False
+
+        self._parser.write(chunk)
+        return True
+
+    def _on_part_begin(self) -> None:
+        self._part_name = None
+        self._part_value.clear()
+        self._part_headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._part_headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def _on_headers_finished(self) -> None:
+        _, params = parse_options_header(self._part_headers.get(b"content-disposition", b""))
+        self._part_name = params.get(b"name", b"").decode("utf-8")
+        if self._part_name == self._file_field and not self._file_started:
+            self._file_started = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._is_file_part():
+            self._file_chunks.append(bytes(data[start:end]))
+        else:
+            self._part_value += data[start:end]
+
+    def _on_part_end(self) -> None:
+        if self._is_file_part():
+            self._file_done = True
+        elif self._part_name and not self._file_started:
+            self.fields[self._part_name] = self._part_value.decode("utf-8")
+
+    def _is_file_part(self) -> bool:
+        return self._part_name == self._file_field and not self._file_done
@@ -1,55 +1,200 @@
 """Database connection and session management."""
 import asyncio
+import logging
+import math
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from typing import Any
 
+from fastapi import Request
 from google.cloud.sql.connector import Connector
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from aitrace.common.pool_metrics import InstrumentedAsyncPool
 from aitrace.common.settings import settings
 
+logger = logging.getLogger(__name__)
+
+# Replication lag in seconds; 0 on a primary or a replica that replayed all it received
+_REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+# Set on clients that just wrote; their reads stay on the primary until it expires
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
 
 class SessionWrapper:
     def __init__(self):
         self.connector = None
+        self.engine = None
         self.AsyncSessionLocal = None
+        self.replica_engine = None
+        self.ReplicaSessionLocal = None
+        self.replica_lag: float | None = None  # None until checked or while unreachable
+        self._replica_checked_at = 0.0
+        self._replica_check_lock = asyncio.Lock()
 
     async def connect(self):
+        self.engine = self._create_engine(
+            settings.POSTGRES_HOST, settings.POSTGRES_PORT, settings.POSTGRES_CLOUD_SQL_INSTANCE
+        )
+        self.AsyncSessionLocal = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+
+        if settings.POSTGRES_REPLICA_HOST or settings.POSTGRES_REPLICA_CLOUD_SQL_INSTANCE:
+            self.replica_engine = self._create_engine(
+                settings.POSTGRES_REPLICA_HOST,
+                settings.POSTGRES_REPLICA_PORT or settings.POSTGRES_PORT,
+                settings.POSTGRES_REPLICA_CLOUD_SQL_INSTANCE,
+                pool_size=settings.DB_REPLICA_POOL_SIZE,
+            )
+            self.ReplicaSessionLocal = async_sessionmaker(
+                self.replica_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+            )
+
+    def _create_engine(
+        self,
+        host: str | None,
+        port: int | None,
+        cloud_sql_instance: str | None,
+        pool_size: int | None = None,
+    ) -> AsyncEngine:
+        """
+        Create an engine for the primary or the replica.
+
+        Args:
+            host: Database host (direct mode)
+            port: Database port (direct mode)
+            cloud_sql_instance: Cloud SQL instance connection name (cloud_sql mode)
+            pool_size: Pool size, DB_POOL_SIZE if not given
+
+        Returns:
+            Async engine
+        """
+        pool_options = dict(
+            poolclass=InstrumentedAsyncPool,
+            pool_size=pool_size or settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+        # Passed through to asyncpg.connect
+        asyncpg_options = dict(
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            timeout=settings.DB_CONNECT_TIMEOUT,
+            command_timeout=settings.DB_COMMAND_TIMEOUT,
+        )
+
         if settings.POSTGRES_CONNECTION_MODE == "cloud_sql":
-            self.connector = Connector(loop=asyncio.get_event_loop())
-            engine = create_async_engine(
+            if self.connector is None:
+                self.connector = Connector(loop=asyncio.get_event_loop())
+            return create_async_engine(
                 "postgresql+asyncpg://",
                 async_creator=lambda: self.connector.connect_async(
-                    settings.POSTGRES_CLOUD_SQL_INSTANCE,
+                    cloud_sql_instance,
                     "asyncpg",
                     user=settings.POSTGRES_USER,
                     password=settings.POSTGRES_PASSWORD,
                     db=settings.POSTGRES_DB,
+                    **asyncpg_options,
                 ),
                 echo=settings.LOG_LEVEL == "DEBUG",
-                pool_pre_ping=True,
-                pool_size=20,
-                max_overflow=10,
+                **pool_options,
             )
-        else:
-            database_url = (f"postgresql+asyncpg://{settings.POSTGRES_USER}:"
-                            f"{settings.POSTGRES_PASSWORD}"
-                            f"@"
-                            f"{settings.POSTGRES_HOST}:"
-                            f"{settings.POSTGRES_PORT}/"
-                            f"{settings.POSTGRES_DB}")
-            engine = create_async_engine(
-                database_url,
-                echo=settings.LOG_LEVEL == "DEBUG",
-                pool_pre_ping=True,
-            )
-        self.AsyncSessionLocal = async_sessionmaker(
-            engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
+
+        database_url = (f"postgresql+asyncpg://{settings.POSTGRES_USER}:"
+                        f"{settings.POSTGRES_PASSWORD}"
+                        f"@"
+                        f"{host}:"
+                        f"{port}/"
+                        f"{settings.POSTGRES_DB}")
+        return create_async_engine(
+            database_url,
+            echo=settings.LOG_LEVEL == "DEBUG",
+            connect_args=asyncpg_options,
+            **pool_options,
         )
 
+    def pool_stats(self) -> dict[str, Any]:
+        """
+        Get live usage and counters of the connection pools.
+
+        Returns:
+            Pool statistics, with a "replica" entry when a replica is configured
+        """
+        stats = self.engine.pool.stats()
+        if self.replica_engine is not None:
+            stats["replica"] = {**self.replica_engine.pool.stats(), "lag_seconds": self.replica_lag}
+        return stats
+
+    async def replica_available(self) -> bool:
+        """
+        Check whether reads can go to the replica.
+
+        The replica's lag is measured at most every REPLICA_LAG_CHECK_INTERVAL_SECONDS.
+        Until the first measurement completes, reads go to the primary.
+
+        Returns:
+            True if a replica is configured, reachable and within REPLICA_MAX_LAG_SECONDS
+        """
+        if self.replica_engine is None:
+            return False
+
+        # Requests arriving while a check runs use the previous result instead of waiting
+        interval = settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS
+        stale = time.monotonic() - self._replica_checked_at >= interval
+        if stale and not self._replica_check_lock.locked():
+            async with self._replica_check_lock:
+                self.replica_lag = await self._measure_replica_lag()
+                self._replica_checked_at = time.monotonic()
+
+        return self.replica_lag is not None and self.replica_lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+    async def _measure_replica_lag(self) -> float | None:
+        """
+        Measure the replica's replication lag.
+
+        Returns:
+            Lag in seconds, or None if the replica cannot be reached
+        """
+        try:
+            async with self.replica_engine.connect() as connection:
+                lag = float(await connection.scalar(_REPLICA_LAG_QUERY))
+        except Exception as e:
+            logger.warning(f"Read replica unavailable, reading from the primary: {e!r}")
+            return None
+
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            logger.warning(f"Read replica lags {lag:.1f}s behind, reading from the primary")
+        return lag
+
     async def disconnect(self):
+        if self.replica_engine is not None:
+            await self.replica_engine.dispose()
         if self.connector is not None:
             await self.connector.close_async()
 
@@ -62,26 +207,123 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Get database session.
 
+    A pooled connection is only checked out once the session runs its first
+    statement, and commit/rollback are skipped when it never did.
+
     Yields:
         Database session
     """
     async with session_wrapper.AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            if session.in_transaction():
+                await session.commit()
         except Exception:
-            await session.rollback()
+            if session.in_transaction():
+                await session.rollback()
             raise
         finally:
             await session.close()
 
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
-    FastAPI dependency for database session.
+    FastAPI dependency for the request-scoped database session.
+
+    The session is stored on request.state, so the auth dependency, the
+    route and every service of a request share one session, one connection
+    checkout and one transaction, however the dependency is declared.
+
+    Args:
+        request: FastAPI request
 
     Yields:
         Database session
     """
-    async with get_db() as session:
+    session = getattr(request.state, "db", None)
+    if session is not None:
         yield session
+        return
+
+    async with get_db() as session:
+        request.state.db = session
+        try:
+            yield session
+        finally:
+            request.state.db = None
+
+
+async def get_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for a read-only session, served by the replica when possible.
+
+    Falls back to the request's primary session when no replica is configured,
+    it cannot be reached or it lags more than REPLICA_MAX_LAG_SECONDS, and for
+    clients that wrote recently (see ReadYourWritesMiddleware), so they read
+    their own changes. The replica session is never committed; only use it for
+    routes that don't write.
+
+    Args:
+        request: FastAPI request
+
+    Yields:
+        Database session on the replica or the primary
+    """
+    if _wrote_recently(request) or not await session_wrapper.replica_available():
+        async for session in get_db_session(request):
+            yield session
+        return
+
+    async with session_wrapper.ReplicaSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            if session.in_transaction():
+                await session.rollback()
+            await session.close()
+
+
+def _wrote_recently(request: Request) -> bool:
+    """Check whether the client made a write the replica may not have replayed yet."""
+    try:
+        return time.time() < float(request.cookies.get(READ_PRIMARY_COOKIE, 0))
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware keeping a client's reads on the primary right after it writes.
+
+    Successful write requests (any method but GET, HEAD and OPTIONS) set a
+    cookie for REPLICA_MAX_LAG_SECONDS + REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    the most the replica can lag while it serves reads. Being a cookie, it
+    holds across server processes. Only active when a replica is configured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize middleware."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in _SAFE_METHODS
+            or session_wrapper.replica_engine is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = (
+                    settings.REPLICA_MAX_LAG_SECONDS + settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS
+                )
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{READ_PRIMARY_COOKIE}={time.time() + window:.3f}; "
+                    f"Max-Age={math.ceil(window)}; Path=/; HttpOnly; Secure; SameSite=strict",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
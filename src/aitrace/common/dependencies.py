@@ -1,5 +1,7 @@
 """FastAPI dependencies."""
 
+import hashlib
+import time
 from datetime import datetime
 from typing import Annotated
 from uuid import UUID
@@ -9,20 +11,26 @@ from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from aitrace.common.cache import token_cache, user_cache
 from aitrace.common.database import get_db_session
 from aitrace.common.exceptions import UnauthorizedException
 from aitrace.common.settings import settings
 from aitrace.models.user import User as UserModel
+from aitrace.models.user import UserResponse
 
 
 async def get_current_user(
     request: Request,
     access_token: Annotated[str | None, Cookie()] = None,
     db: AsyncSession = Depends(get_db_session),
-) -> UserModel:
+) -> UserResponse:
     """
     Get current authenticated user from JWT cookie.
 
+    Verified tokens and users are cached per process (users for
+    USER_CACHE_TTL_SECONDS), so most authenticated requests resolve the
+    caller without decoding the token or running a query.
+
     Args:
         request: FastAPI request
         access_token: JWT token from cookie
@@ -37,6 +45,46 @@ async def get_current_user(
     if not access_token:
         raise UnauthorizedException("Not authenticated")
 
+    user_uuid = _verify_access_token(access_token)
+
+    cached = user_cache.get(user_uuid)
+    if cached is not None:
+        return cached
+
+    # Get user from database
+    result = await db.execute(select(UserModel).where(UserModel.id == user_uuid))
+    db_user = result.scalar_one_or_none()
+
+    if db_user is None:
+        raise UnauthorizedException("User not found")
+
+    user = UserResponse.model_validate(db_user)
+    user_cache.set(user_uuid, user)
+
+    return user
+
+
+def _verify_access_token(access_token: str) -> UUID:
+    """
+    Verify a JWT access token and get its subject.
+
+    Verified tokens are cached by digest until they expire, so a token sent
+    with every request is only decoded and its signature checked once.
+
+    Args:
+        access_token: JWT token
+
+    Returns:
+        User ID
+
+    Raises:
+        UnauthorizedException: If the token is invalid or expired
+    """
+    digest = hashlib.sha256(access_token.encode()).hexdigest()
+    user_uuid = token_cache.get(digest)
+    if user_uuid is not None:
+        return user_uuid
+
     try:
         payload = jwt.decode(access_token, settings.SECRET_KEY, algorithms=["HS256"])
         user_id: str | None = payload.get("sub")
@@ -49,22 +97,18 @@ async def get_current_user(
         if datetime.utcnow().timestamp() > exp:
             raise UnauthorizedException("Token expired")
 
-        # Get user from database
-        result = await db.execute(select(UserModel).where(UserModel.id == UUID(user_id)))
-        user = result.scalar_one_or_none()
-
-        if user is None:
-            raise UnauthorizedException("User not found")
+        user_uuid = UUID(user_id)
 
-        return user
-
-    except JWTError:
+    except (JWTError, ValueError):
         raise UnauthorizedException("Invalid token")
 
+    token_cache.set(digest, user_uuid, ttl_seconds=exp - time.time())
+    return user_uuid
+
 
 async def get_current_admin(
-    user: UserModel = Depends(get_current_user),
-) -> UserModel:
+    user: UserResponse = Depends(get_current_user),
+) -> UserResponse:
     """
     Get current authenticated admin user.
 
@@ -41,6 +41,14 @@ class DuplicateException(AppException):
         super().__init__("DUPLICATE", message, 409)
 
 
+class ConflictException(AppException):
+    """Conflicting concurrent change exception."""
+
+    def __init__(self, message: str = "Resource was changed concurrently") -> None:
+        """Initialize conflict exception."""
+        super().__init__("CONFLICT", message, 409)
+
+
 class UnauthorizedException(AppException):
     """Unauthorized exception."""
 
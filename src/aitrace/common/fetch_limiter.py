@@ -0,0 +1,43 @@
+"""Concurrency limits for outbound image fetches."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+
+class FetchLimiter:
+    """Bound concurrent fetches overall and per remote host."""
+
+    def __init__(self, max_concurrency: int, max_per_host: int) -> None:
+        """
+        Initialize fetch limiter.
+
+        Args:
+            max_concurrency: Maximum number of fetches in flight overall
+            max_per_host: Maximum number of fetches in flight against a single host
+        """
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._max_per_host = max_per_host
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        """
+        Hold a fetch slot for the given URL.
+
+        The per-host slot is acquired first so that requests queued behind a slow
+        host do not occupy global slots other hosts could use.
+
+        Args:
+            url: URL about to be fetched
+        """
+        host = urlsplit(url).netloc.lower()
+        host_semaphore = self._hosts.get(host)
+        if host_semaphore is None:
+            host_semaphore = asyncio.Semaphore(self._max_per_host)
+            self._hosts[host] = host_semaphore
+
+        async with host_semaphore:
+            async with self._global:
+                yield
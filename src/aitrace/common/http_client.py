@@ -0,0 +1,35 @@
+"""Shared outbound HTTP client."""
+
+import httpx
+
+from aitrace.common.settings import settings
+
+
+class HttpClientWrapper:
+    """Application-wide pooled HTTP client, opened and closed with the app lifespan."""
+
+    def __init__(self) -> None:
+        self.client: httpx.AsyncClient | None = None
+
+    async def connect(self) -> None:
+        self.client = httpx.AsyncClient(
+            http2=settings.HTTP2_ENABLED,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                settings.HTTP_READ_TIMEOUT,
+                connect=settings.HTTP_CONNECT_TIMEOUT,
+                pool=settings.HTTP_POOL_TIMEOUT,
+            ),
+        )
+
+    async def disconnect(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+
+http_client_wrapper = HttpClientWrapper()
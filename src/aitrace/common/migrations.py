@@ -0,0 +1,428 @@
+"""Versioned SQL schema migrations.
+
+Migrations are the `NNNN_description.sql` files in MIGRATIONS_DIR, applied in
+version order and recorded in aitrace.schema_migrations. A migration runs in
+a single transaction unless it needs to run outside one, which is the case
+when it:
+
+- contains `CREATE/DROP INDEX CONCURRENTLY`,
+- has a `-- migrate:repeat` statement (batched backfill), or
+- starts with a `-- migrate:no-transaction` line.
+
+Such migrations run statement by statement in autocommit mode, so no lock
+outlives the statement that took it. A `-- migrate:repeat` statement is run
+again until it affects no rows; it should change one bounded batch per run,
+for example:
+
+    -- migrate:repeat
+    UPDATE aitrace.dataset_rows SET new_column = ...
+    WHERE id IN (
+        SELECT id FROM aitrace.dataset_rows WHERE new_column IS NULL LIMIT 5000
+    );
+
+Every statement runs with MIGRATION_LOCK_TIMEOUT so DDL waiting for a lock
+gives up instead of queueing application queries behind it, and is retried
+up to MIGRATION_LOCK_RETRIES times.
+
+Run pending migrations with `python -m aitrace.common.migrations`, or at
+startup with MIGRATE_ON_STARTUP.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from aitrace.common.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# pg_advisory_lock key held while migrating, so app instances do not race
+_ADVISORY_LOCK_KEY = 0x61697472616365  # "aitrace"
+
+_FILENAME_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+_CONCURRENTLY_PATTERN = re.compile(r"\bINDEX\s+CONCURRENTLY\b", re.IGNORECASE)
+_CREATE_INDEX_CONCURRENTLY_PATTERN = re.compile(
+    r"\bCREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)"
+    r"\s+ON\s+(?:ONLY\s+)?(?:(\w+)\.)?\w+",
+    re.IGNORECASE,
+)
+_NO_TRANSACTION_DIRECTIVE = "-- migrate:no-transaction"
+_REPEAT_DIRECTIVE = "-- migrate:repeat"
+
+_CREATE_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS aitrace.schema_migrations (
+    version VARCHAR(20) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum VARCHAR(64),  -- NULL for versions included in schema.sql
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+)
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A migration file."""
+
+    version: str
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        """SHA-256 of the migration SQL."""
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+    @property
+    def transactional(self) -> bool:
+        """Whether the migration can run in a single transaction."""
+        first_line = self.sql.lstrip().partition("\n")[0].strip()
+        return not (
+            first_line == _NO_TRANSACTION_DIRECTIVE
+            or _REPEAT_DIRECTIVE in self.sql
+            or _CONCURRENTLY_PATTERN.search(self.sql)
+        )
+
+
+def load_migrations(directory: Path) -> list[Migration]:
+    """
+    Load migration files in version order.
+
+    Args:
+        directory: Migrations directory
+
+    Returns:
+        Migrations sorted by version
+
+    Raises:
+        ValueError: If two files share a version
+    """
+    migrations: dict[str, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME_PATTERN.match(path.name)
+        if not match:
+            logger.warning(f"Ignoring migration file with unexpected name: {path.name}")
+            continue
+
+        version, name = match.groups()
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {path.name}")
+        migrations[version] = Migration(version, name, path.read_text())
+
+    return [migrations[version] for version in sorted(migrations, key=int)]
+
+
+def split_statements(sql: str) -> list[str]:
+    """
+    Split SQL into statements on top-level semicolons.
+
+    Quoted strings, quoted identifiers, dollar-quoted bodies and comments are
+    kept intact. Comments preceding a statement stay attached to it.
+
+    Args:
+        sql: SQL script
+
+    Returns:
+        Statements without the trailing semicolon; comment-only chunks are dropped
+    """
+    statements = []
+    start = 0
+    i = 0
+    length = len(sql)
+
+    while i < length:
+        char = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = length if end == -1 else end + 1
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+        elif char in ("'", '"'):
+            end = i + 1
+            while end < length:
+                if sql[end] == char:
+                    # A doubled quote is an escaped quote
+                    if end + 1 < length and sql[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            i = end + 1
+        elif char == "$" and (tag := re.match(r"\$(?:[A-Za-z_]\w*)?\$", sql[i:])):
+            end = sql.find(tag.group(), i + len(tag.group()))
+            i = length if end == -1 else end + len(tag.group())
+        elif char == ";":
+            statements.append(sql[start:i])
+            i += 1
+            start = i
+        else:
+            i += 1
+
+    statements.append(sql[start:])
+    return [statement.strip() for statement in statements if _has_code(statement)]
+
+
+def _has_code(statement: str) -> bool:
+    """
+    Check whether a chunk of SQL contains more than comments and whitespace.
+
+    Args:
+        statement: SQL chunk
+
+    Returns:
+        True if the chunk contains a statement
+    """
+    without_block_comments = re.sub(r"/\*.*?\*/", "", statement, flags=re.DOTALL)
+    return any(
+        line.strip() and not line.strip().startswith("--")
+        for line in without_block_comments.splitlines()
+    )
+
+
+def _affected_rows(status: str) -> int:
+    """
+    Parse the row count from a command status such as 'UPDATE 5000'.
+
+    Args:
+        status: Command status returned by asyncpg
+
+    Returns:
+        Number of affected rows, 0 if the status has none
+    """
+    last = status.rsplit(" ", 1)[-1]
+    return int(last) if last.isdigit() else 0
+
+
+class MigrationRunner:
+    """Applies pending migrations over a raw asyncpg connection."""
+
+    def __init__(self, conn: asyncpg.Connection, directory: Path) -> None:
+        """
+        Initialize migration runner.
+
+        Args:
+            conn: asyncpg connection outside of any transaction
+            directory: Migrations directory
+        """
+        self.conn = conn
+        self.directory = directory
+
+    async def run(self) -> list[str]:
+        """
+        Apply all pending migrations.
+
+        Returns:
+            Versions applied by this run
+        """
+        await self.conn.execute("SELECT pg_advisory_lock($1)", _ADVISORY_LOCK_KEY)
+        try:
+            await self.conn.execute(_CREATE_VERSION_TABLE)
+            applied = {
+                record["version"]: record["checksum"]
+                for record in await self.conn.fetch(
+                    "SELECT version, checksum FROM aitrace.schema_migrations"
+                )
+            }
+
+            done = []
+            for migration in load_migrations(self.directory):
+                if migration.version in applied:
+                    if applied[migration.version] not in (None, migration.checksum):
+                        logger.warning(
+                            f"Migration {migration.version}_{migration.name} changed "
+                            "after it was applied"
+                        )
+                    continue
+
+                logger.info(f"Applying migration {migration.version}_{migration.name}")
+                if migration.transactional:
+                    await self._with_lock_retries(self._apply_in_transaction, migration)
+                else:
+                    await self._apply_statements(migration)
+                done.append(migration.version)
+
+            return done
+        finally:
+            await self.conn.execute("SELECT pg_advisory_unlock($1)", _ADVISORY_LOCK_KEY)
+
+    async def _apply_in_transaction(self, migration: Migration) -> None:
+        """
+        Apply a migration and record it in one transaction.
+
+        Args:
+            migration: Migration
+        """
+        async with self.conn.transaction():
+            await self.conn.execute(f"SET LOCAL lock_timeout = '{settings.MIGRATION_LOCK_TIMEOUT}'")
+            await self.conn.execute(migration.sql)
+            await self._record(migration)
+
+    async def _apply_statements(self, migration: Migration) -> None:
+        """
+        Apply a migration statement by statement in autocommit mode.
+
+        Args:
+            migration: Migration
+        """
+        await self.conn.execute(f"SET lock_timeout = '{settings.MIGRATION_LOCK_TIMEOUT}'")
+        # Index builds and backfills may legitimately run for a long time
+        await self.conn.execute("SET statement_timeout = 0")
+        try:
+            for statement in split_statements(migration.sql):
+                if _REPEAT_DIRECTIVE in statement:
+                    await self._repeat(statement)
+                else:
+                    await self._with_lock_retries(self._execute, statement)
+            await self._record(migration)
+        finally:
+            await self.conn.execute("RESET lock_timeout")
+            await self.conn.execute("RESET statement_timeout")
+
+    async def _execute(self, statement: str) -> str:
+        """
+        Execute one statement, first dropping an INVALID index left behind by
+        an interrupted CREATE INDEX CONCURRENTLY of the same name.
+
+        Args:
+            statement: SQL statement
+
+        Returns:
+            Command status
+        """
+        match = _CREATE_INDEX_CONCURRENTLY_PATTERN.search(statement)
+        if match:
+            index_name, schema_name = match.group(1), match.group(2) or "public"
+            invalid = await self.conn.fetchval(
+                """
+                SELECT NOT i.indisvalid
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE c.relname = $1 AND n.nspname = $2
+                """,
+                index_name,
+                schema_name,
+            )
+            if invalid:
+                logger.warning(f"Dropping invalid index {schema_name}.{index_name}")
+                await self.conn.execute(
+                    f'DROP INDEX CONCURRENTLY IF EXISTS "{schema_name}"."{index_name}"'
+                )
+
+        return await self.conn.execute(statement)
+
+    async def _repeat(self, statement: str) -> None:
+        """
+        Run a batched backfill statement until it affects no rows.
+
+        Args:
+            statement: SQL statement changing one batch per run
+        """
+        total = 0
+        while True:
+            affected = _affected_rows(await self._with_lock_retries(self._execute, statement))
+            if affected == 0:
+                break
+            total += affected
+            logger.info(f"Backfilled {total} rows")
+            if settings.MIGRATION_BATCH_PAUSE_SECONDS > 0:
+                await asyncio.sleep(settings.MIGRATION_BATCH_PAUSE_SECONDS)
+
+    async def _with_lock_retries(self, operation: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """
+        Run an operation, retrying when it times out waiting for a lock.
+
+        Args:
+            operation: Coroutine function
+            *args: Operation arguments
+
+        Returns:
+            Operation result
+
+        Raises:
+            asyncpg.exceptions.LockNotAvailableError: If every attempt timed out
+        """
+        attempt = 1
+        while True:
+            try:
+                return await operation(*args)
+            except asyncpg.exceptions.LockNotAvailableError:
+                if attempt >= settings.MIGRATION_LOCK_RETRIES:
+                    raise
+                delay = min(2**attempt, 30)
+                logger.warning(
+                    f"Lock timeout (attempt {attempt}/{settings.MIGRATION_LOCK_RETRIES}), "
+                    f"retrying in {delay}s"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _record(self, migration: Migration) -> None:
+        """
+        Record a migration as applied.
+
+        Args:
+            migration: Migration
+        """
+        await self.conn.execute(
+            """
+            INSERT INTO aitrace.schema_migrations (version, name, checksum)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (version) DO NOTHING
+            """,
+            migration.version,
+            migration.name,
+            migration.checksum,
+        )
+
+
+async def migrate(engine: AsyncEngine) -> list[str]:
+    """
+    Apply pending migrations using a connection from the engine.
+
+    Args:
+        engine: Application engine
+
+    Returns:
+        Versions applied
+    """
+    async with engine.connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        runner = MigrationRunner(raw_connection.driver_connection, Path(settings.MIGRATIONS_DIR))
+        applied = await runner.run()
+
+    if applied:
+        logger.info(f"Applied migrations: {', '.join(applied)}")
+    else:
+        logger.info("Database schema is up to date")
+    return applied
+
+
+async def _main() -> None:
+    """Apply pending migrations and exit."""
+    from aitrace.common.database import session_wrapper
+
+    await session_wrapper.connect()
+    try:
+        await migrate(session_wrapper.engine)
+    finally:
+        await session_wrapper.disconnect()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=settings.LOG_LEVEL,
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    asyncio.run(_main())
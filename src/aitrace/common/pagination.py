@@ -0,0 +1,45 @@
+"""Opaque cursors for keyset pagination."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from aitrace.common.exceptions import ValidationException
+
+
+def encode_cursor(updated_at: datetime, row_id: UUID) -> str:
+    """
+    Encode the sort key of the last item of a page as an opaque cursor.
+
+    Args:
+        updated_at: Last item's updated_at
+        row_id: Last item's ID
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([updated_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of (updated_at, id)
+
+    Raises:
+        ValidationException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(updated_at), UUID(row_id)
+    except (binascii.Error, AttributeError, TypeError, ValueError) as e:
+        raise ValidationException("Invalid cursor") from e
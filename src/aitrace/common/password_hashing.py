@@ -0,0 +1,72 @@
+"""Password hashing off the event loop."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from aitrace.common.settings import settings
+
+# bcrypt releases the GIL while hashing, so a few threads hash passwords in
+# parallel without blocking the event loop. The pool bounds the CPU spent on
+# a burst of logins; requests beyond it wait for a free worker.
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+        )
+    return _executor
+
+
+def _hash(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS))
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hash password using bcrypt in the worker pool.
+
+    Args:
+        password: Plain password
+
+    Returns:
+        Hashed password
+    """
+    loop = asyncio.get_running_loop()
+    hashed = await loop.run_in_executor(_get_executor(), _hash, password.encode("utf-8"))
+    return hashed.decode("utf-8")
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify password using bcrypt in the worker pool.
+
+    The cost factor is read from the hash, so hashes made with a previous
+    BCRYPT_ROUNDS keep verifying.
+
+    Args:
+        plain_password: Plain password
+        hashed_password: Hashed password
+
+    Returns:
+        True if password matches
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(),
+        bcrypt.checkpw,
+        plain_password.encode("utf-8"),
+        hashed_password.encode("utf-8"),
+    )
+
+
+def shutdown() -> None:
+    """Stop the worker pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
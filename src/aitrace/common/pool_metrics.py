@@ -0,0 +1,73 @@
+"""Connection pool instrumentation."""
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.pool.base import ConnectionPoolEntry
+
+
+@dataclass
+class PoolCounters:
+    """Cumulative pool counters since the engine was created."""
+
+    checkouts: int = 0
+    waits: int = 0  # Checkouts that found the pool and its overflow exhausted
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    timeouts: int = 0
+    connections_created: int = 0
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that counts checkouts and time spent waiting for one."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.counters = PoolCounters()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        exhausted = -1 < self._max_overflow <= self._overflow and self.checkedin() == 0
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.counters.timeouts += 1
+            raise
+        finally:
+            if exhausted:
+                waited = time.perf_counter() - start
+                self.counters.waits += 1
+                self.counters.wait_seconds += waited
+                self.counters.max_wait_seconds = max(self.counters.max_wait_seconds, waited)
+
+        self.counters.checkouts += 1
+        return entry
+
+    def _create_connection(self) -> ConnectionPoolEntry:
+        entry = super()._create_connection()
+        self.counters.connections_created += 1
+        return entry
+
+    def recreate(self) -> "InstrumentedAsyncPool":
+        pool = super().recreate()
+        pool.counters = self.counters
+        return pool
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Snapshot of the pool state and counters.
+
+        Returns:
+            Pool size, live usage and cumulative counters
+        """
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            **asdict(self.counters),
+        }
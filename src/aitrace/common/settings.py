@@ -21,5 +21,88 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str | None = None
     POSTGRES_PORT: int | None = None
 
+    # Connection pool
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10  # Connections allowed beyond DB_POOL_SIZE under load
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced (-1 never)
+    DB_POOL_PRE_PING: bool = True  # Ping connections on checkout (one round-trip each)
+    DB_CONNECT_TIMEOUT: float = 10.0
+    DB_COMMAND_TIMEOUT: float | None = None  # Seconds before a query is cancelled client-side
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection (0 for PgBouncer)
+    DB_POOL_STATS_LOG_INTERVAL_SECONDS: int = 0  # Log pool statistics periodically (0 disables)
+
+    # Read replica (optional; same user, password and database as the primary)
+    POSTGRES_REPLICA_HOST: str | None = None  # If direct mode
+    POSTGRES_REPLICA_PORT: int | None = None  # Defaults to POSTGRES_PORT
+    POSTGRES_REPLICA_CLOUD_SQL_INSTANCE: str | None = None  # If cloud_sql mode
+    DB_REPLICA_POOL_SIZE: int | None = None  # Defaults to DB_POOL_SIZE
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Reads go to the primary while the replica lags more
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 2.0  # Max age of the measured lag
+
+    # Authenticated user cache (per process)
+    USER_CACHE_MAX_SIZE: int = 10000  # 0 disables the cache
+    USER_CACHE_TTL_SECONDS: float = 30.0  # Max staleness of a user's role/team on other processes
+    TOKEN_CACHE_MAX_SIZE: int = 10000  # Verified access tokens cached per process (0 disables)
+    TOKEN_CACHE_MAX_TTL_SECONDS: float = 3600.0  # Entries never outlive the token's exp either
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Cost factor of new hashes (each +1 doubles the time)
+    PASSWORD_HASH_WORKERS: int = 4  # Threads hashing/verifying passwords off the event loop
+
+    # Schema migrations
+    MIGRATIONS_DIR: str = "database/migrations"
+    MIGRATE_ON_STARTUP: bool = False  # Apply pending migrations when the app starts
+    MIGRATION_LOCK_TIMEOUT: str = "5s"  # Max wait for a lock before a DDL statement is retried
+    MIGRATION_LOCK_RETRIES: int = 10
+    MIGRATION_BATCH_PAUSE_SECONDS: float = 0.1  # Pause between batches of a batched backfill
+
+    # Outbound HTTP client (image fetching)
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection is kept open
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 10.0
+    HTTP_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free pooled connection
+
+    # Image hashing
+    IMAGE_MAX_BYTES: int = 50 * 1024 * 1024  # Downloads larger than this are rejected
+    IMAGE_HASH_CHUNK_SIZE: int = 64 * 1024  # Bytes read and hashed at a time
+    IMAGE_VALIDATE_CONTENT: bool = False  # Reject non-image content types and signatures
+
+    # URL -> image hash cache
+    IMAGE_HASH_CACHE_ENABLED: bool = True
+    IMAGE_HASH_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60  # Entries older than this are evicted
+    IMAGE_HASH_CACHE_REVALIDATE: bool = False  # Revalidate entries with ETag/Last-Modified
+    IMAGE_HASH_CACHE_EVICT_INTERVAL_SECONDS: int = 60 * 60  # 0 disables eviction
+
+    # Image fetching (CSV import)
+    IMAGE_FETCH_CONCURRENCY: int = 32  # Max image downloads in flight per import
+    IMAGE_FETCH_PER_HOST_CONCURRENCY: int = 8  # Max image downloads in flight per host
+    IMPORT_BATCH_SIZE: int = 200  # Rows hashed and stored together
+    IMPORT_PREFETCH_BATCHES: int = 2  # Batches fetched ahead while the current one is stored
+
+    # Row listing
+    COUNT_ESTIMATE_EXACT_THRESHOLD: int = 10000  # Estimated totals below this are counted exactly
+    ROW_COUNTS_COMPACT_INTERVAL_SECONDS: int = 300  # Compaction of per-dataset row counts (0 disables)
+
+    # Image thumbnails (require the 'thumbnails' extra)
+    THUMBNAIL_SIZES: list[int] = [128, 256, 512]  # Longest edge in pixels of each variant
+    THUMBNAIL_QUALITY: int = 80  # WebP/JPEG encoder quality (1-95)
+    THUMBNAIL_WORKERS: int = 2  # Processes resizing images
+    THUMBNAIL_CACHE_DIR: str = "/tmp/aitrace-thumbnails"
+    THUMBNAIL_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # LRU files evicted beyond this
+    THUMBNAIL_CACHE_MAX_AGE_SECONDS: int = 24 * 60 * 60  # Browser cache lifetime of a thumbnail
+    THUMBNAILS_ON_IMPORT: bool = False  # Render from the bytes downloaded for hashing
+
+    # Review sessions
+    REVIEW_LEASE_SECONDS: int = 300  # Rows stay claimed by an idle reviewer this long
+
+    # Export
+    EXPORT_FETCH_SIZE: int = 1000  # Rows fetched per server-side cursor round-trip
+    EXPORT_CHUNK_SIZE: int = 64 * 1024  # Characters buffered before a chunk is sent
+    EXPORT_PARQUET_ROW_GROUP_SIZE: int = 10000  # Rows per Parquet row group
+
 
 settings = Settings()
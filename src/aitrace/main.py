@@ -1,19 +1,30 @@
 """Main FastAPI application."""
 
+import asyncio
+import contextlib
 import logging
 import os
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Annotated, Any
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
-from aitrace.common.database import session_wrapper
+from aitrace.common import password_hashing
+from aitrace.common.database import ReadYourWritesMiddleware, get_db, session_wrapper
+from aitrace.common.dependencies import get_current_admin
 from aitrace.common.exceptions import AppException
+from aitrace.common.http_client import http_client_wrapper
+from aitrace.common.migrations import migrate
 from aitrace.common.settings import settings
+from aitrace.models.user import UserResponse
 from aitrace.routes import auth, datasets, rows, schemas, setup, users
+from aitrace.services import thumbnails
+from aitrace.services.dataset_service import DatasetService
+from aitrace.services.row_service import RowService
 
 # Configure logging
 logging.basicConfig(
@@ -25,6 +36,35 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def compact_row_counts_periodically() -> None:
+    """Periodically fold the row count deltas written by dataset_rows triggers."""
+    while True:
+        await asyncio.sleep(settings.ROW_COUNTS_COMPACT_INTERVAL_SECONDS)
+        try:
+            async with get_db() as db:
+                await DatasetService(db).compact_row_counts()
+        except Exception:
+            logger.exception("Row count compaction failed")
+
+
+async def evict_image_hashes_periodically() -> None:
+    """Periodically delete expired URL hash cache entries."""
+    while True:
+        await asyncio.sleep(settings.IMAGE_HASH_CACHE_EVICT_INTERVAL_SECONDS)
+        try:
+            async with get_db() as db:
+                await RowService(db).evict_expired_image_hashes()
+        except Exception:
+            logger.exception("Image hash cache eviction failed")
+
+
+async def log_pool_stats_periodically() -> None:
+    """Periodically log connection pool usage."""
+    while True:
+        await asyncio.sleep(settings.DB_POOL_STATS_LOG_INTERVAL_SECONDS)
+        logger.info(f"DB pool stats: {session_wrapper.pool_stats()}")
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
@@ -33,13 +73,30 @@ async def lifespan(_: FastAPI):
     logger.info(f"Environment: {settings.ENV}")
     logger.info(f"Log level: {settings.LOG_LEVEL}")
     await session_wrapper.connect()
+    if settings.MIGRATE_ON_STARTUP:
+        await migrate(session_wrapper.engine)
+    await http_client_wrapper.connect()
+    background_tasks = []
+    if settings.ROW_COUNTS_COMPACT_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(compact_row_counts_periodically()))
+    if settings.IMAGE_HASH_CACHE_ENABLED and settings.IMAGE_HASH_CACHE_EVICT_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(evict_image_hashes_periodically()))
+    if settings.DB_POOL_STATS_LOG_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(log_pool_stats_periodically()))
 
     yield
 
     # Shutdown
     logger.info("Shutting down AITrace Datasets API")
+    for task in background_tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
     logger.info("Database connections cleaned up")
+    await http_client_wrapper.disconnect()
     await session_wrapper.disconnect()
+    password_hashing.shutdown()
+    thumbnails.shutdown()
 
 
 # Create FastAPI app
@@ -52,6 +109,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Reads right after a client's writes go to the primary, not the replica
+app.add_middleware(ReadYourWritesMiddleware)
+
 # CORS middleware (for local development)
 if settings.ENV == "local":
     app.add_middleware(
@@ -91,6 +151,14 @@ async def health_check() -> dict[str, str]:
     return {"status": "healthy"}
 
 
+@app.get("/api/v1/health/db-pool")
+async def db_pool_stats(
+    _: Annotated[UserResponse, Depends(get_current_admin)],
+) -> dict[str, Any]:
+    """Connection pool usage: live checkouts and overflow, cumulative checkouts, waits and timeouts."""
+    return session_wrapper.pool_stats()
+
+
 # API routes
 app.include_router(setup.router, prefix="/api/v1")
 app.include_router(auth.router, prefix="/api/v1")
@@ -1,7 +1,14 @@
 """Models package."""
 
 from aitrace.models.base import Base, PaginatedResponse
-from aitrace.models.dataset import Dataset, DatasetCreate, DatasetResponse, DatasetUpdate
+from aitrace.models.dataset import (
+    Dataset,
+    DatasetCreate,
+    DatasetResponse,
+    DatasetRowCount,
+    DatasetUpdate,
+)
+from aitrace.models.image_hash_cache import ImageHashCache
 from aitrace.models.row import DatasetRow, DatasetRowCreate, DatasetRowResponse, DatasetRowUpdate
 from aitrace.models.schema import Schema, SchemaCreate, SchemaField, SchemaResponse, SchemaUpdate
 from aitrace.models.team import Team, TeamCreate, TeamResponse, TeamUpdate
@@ -28,8 +35,10 @@ __all__ = [
     "DatasetCreate",
     "DatasetResponse",
     "DatasetUpdate",
+    "DatasetRowCount",
     "DatasetRow",
     "DatasetRowCreate",
     "DatasetRowResponse",
     "DatasetRowUpdate",
+    "ImageHashCache",
 ]
@@ -1,6 +1,7 @@
 """Base models."""
 
 from datetime import datetime
+from enum import Enum
 from typing import Any, Generic, TypeVar
 from uuid import UUID
 
@@ -16,6 +17,10 @@ Base = declarative_base()
 class TimestampMixin:
     """Mixin for created_at and updated_at timestamps."""
 
+    # Fetch the server-generated timestamps with INSERT/UPDATE ... RETURNING on flush,
+    # so written entities are complete without a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
 
@@ -23,17 +28,29 @@ class TimestampMixin:
 T = TypeVar('T')
 
 
+class CountMode(str, Enum):
+    """How the total of a paginated listing is computed."""
+
+    EXACT = "exact"  # COUNT(*) over all matching rows
+    ESTIMATE = "estimate"  # Planner statistics, exact for small results
+    NONE = "none"  # No total
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """Paginated response."""
 
     model_config = ConfigDict(from_attributes=True)
 
     items: list[T]
-    total: int
+    total: int | None
     page: int
     page_size: int
+    next_cursor: str | None = None  # Set by endpoints that support keyset pagination
+    count: CountMode = CountMode.EXACT
 
     @property
-    def total_pages(self) -> int:
+    def total_pages(self) -> int | None:
         """Calculate total pages."""
+        if self.total is None:
+            return None
         return (self.total + self.page_size - 1) // self.page_size
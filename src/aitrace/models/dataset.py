@@ -4,7 +4,7 @@ from datetime import datetime
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import Column, ForeignKey, String
+from sqlalchemy import BigInteger, Column, ForeignKey, Identity, String
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import relationship
 
@@ -30,6 +30,23 @@ class Dataset(Base, TimestampMixin):
     rows = relationship("DatasetRow", back_populates="dataset", cascade="all, delete-orphan")
 
 
+class DatasetRowCount(Base):
+    """
+    Row count delta for a dataset and status.
+
+    Rows are appended by triggers on dataset_rows; the count of a status is
+    the sum of its deltas.
+    """
+
+    __tablename__ = "dataset_row_counts"
+    __table_args__ = {'schema': 'aitrace'}
+
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
+    dataset_id = Column(PGUUID(as_uuid=True), ForeignKey("aitrace.datasets.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False)
+    row_count = Column(BigInteger, nullable=False)
+
+
 class DatasetBase(BaseModel):
     """Dataset base schema."""
 
@@ -55,8 +72,9 @@ class DatasetResponse(DatasetBase):
     created_at: datetime
     updated_by: UUID | None
     updated_at: datetime
-    rows_count: int = 0
+    rows_count: int = 0  # Reviewed rows
     pending_count: int = 0
+    status_counts: dict[str, int] = Field(default_factory=dict)  # Row count per status
 
 
 class DatasetUpdate(BaseModel):
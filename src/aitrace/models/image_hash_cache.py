@@ -0,0 +1,20 @@
+"""Image hash cache models."""
+
+from sqlalchemy import Column, DateTime, String, Text
+from sqlalchemy.sql import func
+
+from aitrace.models.base import Base
+
+
+class ImageHashCache(Base):
+    """Cached image hash for a URL, with HTTP validators for revalidation."""
+
+    __tablename__ = "image_hash_cache"
+    __table_args__ = {"schema": "aitrace"}
+
+    url_sha256 = Column(String(64), primary_key=True)
+    url = Column(Text, nullable=False)
+    image_hash = Column(String(32), nullable=False)
+    etag = Column(Text)
+    last_modified = Column(Text)
+    fetched_at = Column(DateTime, nullable=False, server_default=func.now())
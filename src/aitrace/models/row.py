@@ -6,7 +6,7 @@ from typing import Any
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl
-from sqlalchemy import Column, ForeignKey, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
 from sqlalchemy.orm import relationship
 
@@ -34,6 +34,8 @@ class DatasetRow(Base, TimestampMixin):
     status = Column(String(20), nullable=False, default="pending")
     created_by = Column(PGUUID(as_uuid=True), ForeignKey("aitrace.users.id", ondelete="SET NULL"))
     updated_by = Column(PGUUID(as_uuid=True), ForeignKey("aitrace.users.id", ondelete="SET NULL"))
+    leased_by = Column(PGUUID(as_uuid=True))  # Reviewer holding the row, see review_session
+    lease_expires_at = Column(DateTime)
 
     # Relationships
     dataset = relationship("Dataset", back_populates="rows")
@@ -86,12 +88,80 @@ class BulkUpdateStatusRequest(BaseModel):
     status: RowStatus
 
 
-class CSVImportRequest(BaseModel):
-    """CSV import request."""
+class ReviewAction(str, Enum):
+    """Review session decision."""
+
+    APPROVE = "approve"  # Save the row's data and mark it reviewed
+    SKIP = "skip"  # Leave the row pending
+    DELETE = "delete"
+
+
+class ReviewDecision(BaseModel):
+    """Decision on one row of a review session."""
+
+    row_id: UUID
+    action: ReviewAction
+    data: dict[str, Any] | None = None  # Edited data saved with an approval
+
+
+class ReviewSessionRequest(BaseModel):
+    """
+    Review session request: decisions on delivered rows, and how many rows to claim next.
+
+    Delivered rows are leased to the reviewer for REVIEW_LEASE_SECONDS, renewed
+    with every request of the session.
+    """
+
+    decisions: list[ReviewDecision] = Field(default_factory=list, max_length=500)
+    limit: int = Field(20, ge=0, le=100)
+    continuation: str | None = None  # Token returned with the previous batch
+    release: bool = False  # End the session: release the leases of rows not decided on
+
+
+class ReviewSessionResponse(BaseModel):
+    """Review session response."""
+
+    rows: list[DatasetRowResponse]
+    continuation: str | None  # None when the queue is exhausted
+    pending_count: int  # Pending rows left in the dataset
+    # Decisions not applied: the row is gone or leased by another reviewer
+    conflicts: list[UUID] = Field(default_factory=list)
+
+
+class ImportMode(str, Enum):
+    """CSV import load mode."""
+
+    INSERT = "insert"  # Batched multi-row INSERTs
+    COPY = "copy"  # Binary COPY into a staging table, merged at the end (large imports)
+
+
+class ExportFormat(str, Enum):
+    """Row export format."""
+
+    CSV = "csv"
+    JSONL = "jsonl"
+    PARQUET = "parquet"
+
+
+class ThumbnailFormat(str, Enum):
+    """Row image thumbnail format."""
+
+    WEBP = "webp"
+    JPEG = "jpeg"
+
+
+class CSVImportOptions(BaseModel):
+    """CSV import options."""
 
-    file_content: str
     column_mapping: dict[str, str]  # CSV column name -> field_id
     mark_all_pending: bool = False
+    mode: ImportMode = ImportMode.INSERT
+
+
+class CSVImportRequest(CSVImportOptions):
+    """CSV import request."""
+
+    file_content: str
 
 
 class CSVImportResponse(BaseModel):
@@ -1,6 +1,7 @@
 """Repositories package."""
 
 from aitrace.repositories.dataset_repository import DatasetRepository
+from aitrace.repositories.image_hash_cache_repository import ImageHashCacheRepository
 from aitrace.repositories.row_repository import DatasetRowRepository
 from aitrace.repositories.schema_repository import SchemaFieldRepository, SchemaRepository
 from aitrace.repositories.team_repository import TeamRepository
@@ -13,4 +14,5 @@ __all__ = [
     "SchemaFieldRepository",
     "DatasetRepository",
     "DatasetRowRepository",
+    "ImageHashCacheRepository",
 ]
@@ -76,6 +76,9 @@ class BaseRepository(Generic[ModelType]):
         """
         Create entity.
 
+        Server-generated columns are returned by the INSERT itself (see
+        TimestampMixin), so the entity is not refreshed.
+
         Args:
             entity: Entity to create
 
@@ -84,7 +87,6 @@ class BaseRepository(Generic[ModelType]):
         """
         self.db.add(entity)
         await self.db.flush()
-        await self.db.refresh(entity)
         return entity
 
     async def update(self, entity: ModelType) -> ModelType:
@@ -98,7 +100,6 @@ class BaseRepository(Generic[ModelType]):
             Updated entity
         """
         await self.db.flush()
-        await self.db.refresh(entity)
         return entity
 
     async def delete(self, id: UUID) -> None:
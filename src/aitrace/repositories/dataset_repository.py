@@ -2,11 +2,10 @@
 
 from uuid import UUID
 
-from sqlalchemy import exists, func, select
+from sqlalchemy import exists, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from aitrace.models.dataset import Dataset
-from aitrace.models.row import DatasetRow
+from aitrace.models.dataset import Dataset, DatasetRowCount
 from aitrace.repositories.base_repository import BaseRepository
 
 
@@ -70,42 +69,35 @@ class DatasetRepository(BaseRepository[Dataset]):
         result = await self.db.execute(query)
         return result.scalar() or False
 
-    async def get_rows_count(self, dataset_id: UUID) -> int:
+    async def get_status_counts(self, dataset_ids: list[UUID]) -> dict[UUID, dict[str, int]]:
         """
-        Get reviewed rows count for dataset.
+        Get row counts by status for a batch of datasets in one query.
 
         Args:
-            dataset_id: Dataset ID
+            dataset_ids: Dataset IDs
 
         Returns:
-            Number of reviewed rows
+            Dataset ID -> {status: row count}; datasets without rows map to {}
         """
+        counts: dict[UUID, dict[str, int]] = {dataset_id: {} for dataset_id in dataset_ids}
+        if not dataset_ids:
+            return counts
+
         result = await self.db.execute(
-            select(func.count())
-            .select_from(DatasetRow)
-            .where(
-                DatasetRow.dataset_id == dataset_id,
-                DatasetRow.status == "reviewed"
+            select(
+                DatasetRowCount.dataset_id,
+                DatasetRowCount.status,
+                func.sum(DatasetRowCount.row_count),
             )
+            .where(DatasetRowCount.dataset_id.in_(dataset_ids))
+            .group_by(DatasetRowCount.dataset_id, DatasetRowCount.status)
         )
-        return result.scalar() or 0
+        for dataset_id, status, row_count in result:
+            if row_count:
+                counts[dataset_id][status] = int(row_count)
 
-    async def get_pending_count(self, dataset_id: UUID) -> int:
-        """
-        Get pending rows count for dataset.
+        return counts
 
-        Args:
-            dataset_id: Dataset ID
-
-        Returns:
-            Number of pending rows
-        """
-        result = await self.db.execute(
-            select(func.count())
-            .select_from(DatasetRow)
-            .where(
-                DatasetRow.dataset_id == dataset_id,
-                DatasetRow.status == "pending"
-            )
-        )
-        return result.scalar() or 0
+    async def compact_row_counts(self) -> None:
+        """Fold the row count deltas written by triggers into one row per dataset and status."""
+        await self.db.execute(text("SELECT aitrace.compact_dataset_row_counts()"))
@@ -0,0 +1,96 @@
+"""Image hash cache repository."""
+
+import hashlib
+from datetime import timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aitrace.models.image_hash_cache import ImageHashCache
+from aitrace.repositories.base_repository import BaseRepository
+
+
+class ImageHashCacheRepository(BaseRepository[ImageHashCache]):
+    """Image hash cache repository."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        """Initialize image hash cache repository."""
+        super().__init__(ImageHashCache, db)
+
+    @staticmethod
+    def url_key(url: str) -> str:
+        """
+        Get cache key for URL.
+
+        Args:
+            url: Image URL
+
+        Returns:
+            SHA-256 hex digest of the URL
+        """
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    async def get_many(self, urls: list[str], ttl_seconds: int) -> dict[str, ImageHashCache]:
+        """
+        Get unexpired cache entries for URLs.
+
+        Args:
+            urls: Image URLs
+            ttl_seconds: Maximum entry age in seconds
+
+        Returns:
+            Mapping of URL to cache entry
+        """
+        if not urls:
+            return {}
+
+        result = await self.db.execute(
+            select(ImageHashCache).where(
+                ImageHashCache.url_sha256.in_({self.url_key(url) for url in urls}),
+                ImageHashCache.fetched_at >= func.now() - timedelta(seconds=ttl_seconds),
+            )
+        )
+        return {entry.url: entry for entry in result.scalars().all()}
+
+    async def upsert_many(self, entries: list[dict[str, str | None]]) -> None:
+        """
+        Insert or refresh cache entries.
+
+        Rows are written in key order, so concurrent upserts lock them in the
+        same order and cannot deadlock.
+
+        Args:
+            entries: Dicts with url, image_hash, etag and last_modified
+        """
+        if not entries:
+            return
+
+        # Deduplicate by key, a single upsert cannot touch the same row twice
+        values = {self.url_key(e["url"]): e for e in entries}
+        stmt = insert(ImageHashCache).values(
+            [{**values[key], "url_sha256": key} for key in sorted(values)]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ImageHashCache.url_sha256],
+            set_={
+                "image_hash": stmt.excluded.image_hash,
+                "etag": stmt.excluded.etag,
+                "last_modified": stmt.excluded.last_modified,
+                "fetched_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def delete_expired(self, ttl_seconds: int) -> None:
+        """
+        Evict entries older than the TTL.
+
+        Args:
+            ttl_seconds: Maximum entry age in seconds
+        """
+        await self.db.execute(
+            delete(ImageHashCache).where(
+                ImageHashCache.fetched_at < func.now() - timedelta(seconds=ttl_seconds)
+            )
+        )
@@ -1,14 +1,60 @@
 """Dataset row repository."""
 
-from uuid import UUID
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import delete, exists, func, select
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    not_,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from aitrace.common.settings import settings
+from aitrace.models.base import CountMode
 from aitrace.models.row import DatasetRow
+from aitrace.models.user import User
 from aitrace.repositories.base_repository import BaseRepository
 
+# Columns copied into the bulk load staging table
+_STAGING_COLUMNS = [
+    "id",
+    "dataset_id",
+    "image_url",
+    "image_hash",
+    "data",
+    "status",
+    "created_by",
+    "updated_by",
+]
+
+
+def _lease_available(reviewer_id: UUID) -> ColumnElement[bool]:
+    """Condition for rows a reviewer may write: not leased by another reviewer."""
+    return or_(
+        DatasetRow.leased_by.is_(None),
+        DatasetRow.leased_by == reviewer_id,
+        DatasetRow.lease_expires_at <= func.now(),
+    )
+
 
 class DatasetRowRepository(BaseRepository[DatasetRow]):
     """Dataset row repository."""
@@ -23,18 +69,26 @@ class DatasetRowRepository(BaseRepository[DatasetRow]):
         page: int = 1,
         page_size: int = 20,
         status: str | None = None,
-    ) -> tuple[list[DatasetRow], int]:
+        after: tuple[datetime, UUID] | None = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> tuple[list[DatasetRow], int | None]:
         """
         Get rows by dataset with pagination.
 
+        Rows are ordered by (updated_at, id) descending. When `after` is given
+        the page starts right after that sort key (keyset pagination) and
+        `page` is ignored, so deep pages cost the same as the first one.
+
         Args:
             dataset_id: Dataset ID
-            page: Page number
+            page: Page number (offset pagination)
             page_size: Items per page
             status: Optional status filter
+            after: Optional (updated_at, id) of the last row of the previous page
+            count: How to compute the total
 
         Returns:
-            Tuple of (rows, total_count)
+            Tuple of (rows, total_count), total_count is None for CountMode.NONE
         """
         # Build query with eager loading of user relationships
         query = (
@@ -48,24 +102,21 @@ class DatasetRowRepository(BaseRepository[DatasetRow]):
             query = query.where(DatasetRow.status == status)
 
         # Get total count
-        count_query = select(func.count()).select_from(
-            select(DatasetRow).where(DatasetRow.dataset_id == dataset_id).subquery()
-        )
-        if status:
-            count_query = select(func.count()).select_from(
-                select(DatasetRow)
-                .where(DatasetRow.dataset_id == dataset_id)
-                .where(DatasetRow.status == status)
-                .subquery()
-            )
+        total = None
+        if count == CountMode.EXACT:
+            total = await self.count_by_dataset(dataset_id, status)
+        elif count == CountMode.ESTIMATE:
+            total = await self.estimate_count_by_dataset(dataset_id, status)
 
-        total = await self.db.scalar(count_query) or 0
-
-        # Sort by updated_at descending (most recent first)
-        query = query.order_by(DatasetRow.updated_at.desc())
+        # Sort by updated_at descending (most recent first), id breaks ties
+        query = query.order_by(DatasetRow.updated_at.desc(), DatasetRow.id.desc())
 
         # Apply pagination
-        query = query.offset((page - 1) * page_size).limit(page_size)
+        if after is not None:
+            query = query.where(tuple_(DatasetRow.updated_at, DatasetRow.id) < tuple_(*after))
+        else:
+            query = query.offset((page - 1) * page_size)
+        query = query.limit(page_size)
 
         # Execute query
         result = await self.db.execute(query)
@@ -73,7 +124,97 @@ class DatasetRowRepository(BaseRepository[DatasetRow]):
 
         return items, total
 
-    async def exists_by_image_hash(self, dataset_id: UUID, image_hash: str, exclude_id: UUID | None = None) -> bool:
+    async def count_by_dataset(self, dataset_id: UUID, status: str | None = None) -> int:
+        """
+        Count rows of a dataset.
+
+        Args:
+            dataset_id: Dataset ID
+            status: Optional status filter
+
+        Returns:
+            Number of matching rows
+        """
+        query = (
+            select(func.count()).select_from(DatasetRow).where(DatasetRow.dataset_id == dataset_id)
+        )
+        if status:
+            query = query.where(DatasetRow.status == status)
+
+        return await self.db.scalar(query) or 0
+
+    async def estimate_count_by_dataset(self, dataset_id: UUID, status: str | None = None) -> int:
+        """
+        Estimate the number of rows of a dataset from planner statistics.
+
+        Estimates below COUNT_ESTIMATE_EXACT_THRESHOLD are replaced by an exact
+        count, which is cheap at that size and avoids wrong totals on small datasets.
+
+        Args:
+            dataset_id: Dataset ID
+            status: Optional status filter
+
+        Returns:
+            Estimated number of matching rows
+        """
+        sql = (
+            "EXPLAIN (FORMAT JSON) "
+            "SELECT 1 FROM aitrace.dataset_rows WHERE dataset_id = :dataset_id"
+        )
+        params: dict[str, Any] = {"dataset_id": dataset_id}
+        if status:
+            sql += " AND status = :status"
+            params["status"] = status
+
+        plan = await self.db.scalar(text(sql), params)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+        if estimate < settings.COUNT_ESTIMATE_EXACT_THRESHOLD:
+            return await self.count_by_dataset(dataset_id, status)
+        return estimate
+
+    async def stream_for_export(
+        self, dataset_id: UUID, status: str | None = None
+    ) -> AsyncIterator[Row]:
+        """
+        Stream rows of a dataset for export through a server-side cursor.
+
+        Only the exported columns are selected, with the updater email joined in SQL.
+
+        Args:
+            dataset_id: Dataset ID
+            status: Optional status filter
+
+        Yields:
+            Rows with image_url, data, status, created_at, updated_at and updated_by_email
+        """
+        query = (
+            select(
+                DatasetRow.image_url,
+                DatasetRow.data,
+                DatasetRow.status,
+                DatasetRow.created_at,
+                DatasetRow.updated_at,
+                User.email.label("updated_by_email"),
+            )
+            .outerjoin(User, User.id == DatasetRow.updated_by)
+            .where(DatasetRow.dataset_id == dataset_id)
+            .order_by(DatasetRow.updated_at.desc())
+            .execution_options(yield_per=settings.EXPORT_FETCH_SIZE)
+        )
+
+        if status:
+            query = query.where(DatasetRow.status == status)
+
+        result = await self.db.stream(query)
+        async for row in result:
+            yield row
+
+    async def exists_by_image_hash(
+        self, dataset_id: UUID, image_hash: str, exclude_id: UUID | None = None
+    ) -> bool:
         """
         Check if image hash exists in dataset.
 
@@ -86,10 +227,7 @@ class DatasetRowRepository(BaseRepository[DatasetRow]):
             True if hash exists
         """
         query = select(
-            exists().where(
-                DatasetRow.dataset_id == dataset_id,
-                DatasetRow.image_hash == image_hash
-            )
+            exists().where(DatasetRow.dataset_id == dataset_id, DatasetRow.image_hash == image_hash)
         )
         if exclude_id:
             query = query.where(DatasetRow.id != exclude_id)
@@ -97,47 +235,405 @@ class DatasetRowRepository(BaseRepository[DatasetRow]):
         result = await self.db.execute(query)
         return result.scalar() or False
 
-    async def bulk_update_status(self, row_ids: list[UUID], status: str) -> None:
+    async def get_existing_hashes(self, dataset_id: UUID, image_hashes: list[str]) -> set[str]:
         """
-        Bulk update row status.
+        Get the subset of image hashes already present in dataset.
 
         Args:
-            row_ids: List of row IDs
-            status: New status
+            dataset_id: Dataset ID
+            image_hashes: Image hashes to check
+
+        Returns:
+            Hashes that already exist
+        """
+        if not image_hashes:
+            return set()
+
+        result = await self.db.execute(
+            select(DatasetRow.image_hash).where(
+                DatasetRow.dataset_id == dataset_id,
+                DatasetRow.image_hash.in_(image_hashes),
+            )
+        )
+        return set(result.scalars().all())
+
+    async def insert_many(self, rows: list[dict[str, Any]]) -> list[str]:
         """
-        from sqlalchemy import update
+        Insert rows with a single multi-row INSERT, skipping duplicate images.
 
+        Args:
+            rows: Column values for each row
+
+        Returns:
+            Image hashes of the rows actually inserted
+        """
+        if not rows:
+            return []
+
+        result = await self.db.execute(
+            insert(DatasetRow)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[DatasetRow.dataset_id, DatasetRow.image_hash])
+            .returning(DatasetRow.image_hash)
+        )
+        return list(result.scalars().all())
+
+    async def create_staging_table(self) -> str:
+        """
+        Create a temporary staging table for a bulk load.
+
+        The table is dropped automatically when the transaction commits.
+
+        Returns:
+            Staging table name
+        """
+        table = f"dataset_rows_import_{uuid4().hex[:12]}"
         await self.db.execute(
+            text(
+                f"CREATE TEMP TABLE {table} ("
+                "seq BIGINT GENERATED ALWAYS AS IDENTITY, "
+                "id UUID NOT NULL, dataset_id UUID NOT NULL, image_url TEXT NOT NULL, "
+                "image_hash VARCHAR(32) NOT NULL, data JSONB, status VARCHAR(20) NOT NULL, "
+                "created_by UUID, updated_by UUID"
+                ") ON COMMIT DROP"
+            )
+        )
+        return table
+
+    async def copy_to_staging(self, table: str, rows: list[dict[str, Any]]) -> None:
+        """
+        Stream rows into a staging table with binary COPY.
+
+        Args:
+            table: Staging table name
+            rows: Column values for each row, in file order
+        """
+        if not rows:
+            return
+
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table,
+            columns=_STAGING_COLUMNS,
+            records=[
+                tuple(json.dumps(row["data"]) if c == "data" else row[c] for c in _STAGING_COLUMNS)
+                for row in rows
+            ],
+        )
+
+    async def merge_staging(self, table: str) -> int:
+        """
+        Move staged rows into dataset_rows, keeping the first row per image.
+
+        Rows whose image already exists in the dataset are skipped.
+
+        Args:
+            table: Staging table name
+
+        Returns:
+            Number of rows inserted
+        """
+        columns = ", ".join(_STAGING_COLUMNS)
+        result = await self.db.execute(
+            text(
+                f"INSERT INTO aitrace.dataset_rows ({columns}) "
+                f"SELECT DISTINCT ON (dataset_id, image_hash) {columns} FROM {table} "
+                "ORDER BY dataset_id, image_hash, seq "
+                "ON CONFLICT (dataset_id, image_hash) DO NOTHING"
+            )
+        )
+        return result.rowcount
+
+    async def bulk_update_status(
+        self, row_ids: list[UUID], status: str, reviewer_id: UUID
+    ) -> set[UUID]:
+        """
+        Bulk update row status, except rows leased by another reviewer.
+
+        The reviewer's own leases on the updated rows are released.
+
+        Args:
+            row_ids: List of row IDs
+            status: New status
+            reviewer_id: User making the change
+
+        Returns:
+            IDs of the rows updated
+        """
+        result = await self.db.execute(
             update(DatasetRow)
-            .where(DatasetRow.id.in_(row_ids))
-            .values(status=status)
+            .where(DatasetRow.id.in_(row_ids), _lease_available(reviewer_id))
+            .values(status=status, leased_by=None, lease_expires_at=None)
+            .returning(DatasetRow.id)
         )
         await self.db.flush()
+        return set(result.scalars().all())
 
-    async def bulk_delete(self, row_ids: list[UUID]) -> None:
+    async def bulk_delete(self, row_ids: list[UUID], reviewer_id: UUID) -> set[UUID]:
         """
-        Bulk delete rows.
+        Bulk delete rows, except rows leased by another reviewer.
 
         Args:
             row_ids: List of row IDs
+            reviewer_id: User making the change
+
+        Returns:
+            IDs of the rows deleted
         """
-        await self.db.execute(
-            delete(DatasetRow).where(DatasetRow.id.in_(row_ids))
+        result = await self.db.execute(
+            delete(DatasetRow)
+            .where(DatasetRow.id.in_(row_ids), _lease_available(reviewer_id))
+            .returning(DatasetRow.id)
         )
         await self.db.flush()
+        return set(result.scalars().all())
+
+    async def get_leased_by_others(self, row_ids: list[UUID], reviewer_id: UUID) -> set[UUID]:
+        """
+        Get the rows holding an active lease of another reviewer.
+
+        Args:
+            row_ids: List of row IDs
+            reviewer_id: Reviewer user ID
+
+        Returns:
+            IDs of the leased rows
+        """
+        result = await self.db.execute(
+            select(DatasetRow.id).where(
+                DatasetRow.id.in_(row_ids), not_(_lease_available(reviewer_id))
+            )
+        )
+        return set(result.scalars().all())
+
+    async def approve_rows(
+        self,
+        dataset_id: UUID,
+        approvals: list[tuple[UUID, dict[str, Any] | None]],
+        reviewer_id: UUID,
+    ) -> set[UUID]:
+        """
+        Mark rows of a dataset reviewed in one statement, saving edited data where given.
+
+        Rows leased by another reviewer are left untouched; the reviewer's
+        leases on the approved rows are released.
+
+        Args:
+            dataset_id: Dataset ID, rows of other datasets are left untouched
+            approvals: (row ID, new data or None to keep the current data) pairs
+            reviewer_id: Reviewer user ID
+
+        Returns:
+            IDs of the rows approved
+        """
+        if not approvals:
+            return set()
+
+        rows = DatasetRow.__table__
+        approved = values(
+            column("row_id", PGUUID(as_uuid=True)),
+            column("row_data", JSONB(none_as_null=True)),
+            name="approved",
+        ).data(approvals)
+
+        result = await self.db.execute(
+            update(rows)
+            .where(
+                rows.c.id == approved.c.row_id,
+                rows.c.dataset_id == dataset_id,
+                _lease_available(reviewer_id),
+            )
+            .values(
+                data=func.coalesce(cast(approved.c.row_data, JSONB), rows.c.data),
+                status="reviewed",
+                updated_by=reviewer_id,
+                leased_by=None,
+                lease_expires_at=None,
+            )
+            .returning(rows.c.id)
+        )
+        return set(result.scalars().all())
+
+    async def delete_rows(
+        self, dataset_id: UUID, row_ids: list[UUID], reviewer_id: UUID
+    ) -> set[UUID]:
+        """
+        Delete rows of a dataset, except those leased by another reviewer.
+
+        Args:
+            dataset_id: Dataset ID, rows of other datasets are left untouched
+            row_ids: Row IDs
+            reviewer_id: Reviewer user ID
+
+        Returns:
+            IDs of the rows deleted
+        """
+        if not row_ids:
+            return set()
+
+        result = await self.db.execute(
+            delete(DatasetRow)
+            .where(
+                DatasetRow.id.in_(row_ids),
+                DatasetRow.dataset_id == dataset_id,
+                _lease_available(reviewer_id),
+            )
+            .returning(DatasetRow.id)
+        )
+        return set(result.scalars().all())
+
+    async def claim_pending_rows(
+        self,
+        dataset_id: UUID,
+        reviewer_id: UUID,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[DatasetRow]:
+        """
+        Lease the next pending rows of a dataset to a reviewer.
+
+        Rows leased by others, and rows another transaction is claiming right
+        now (FOR UPDATE SKIP LOCKED), are passed over, so concurrent reviewers
+        get disjoint rows without waiting on each other. Leasing leaves
+        updated_at, and so the queue order, unchanged.
+
+        Args:
+            dataset_id: Dataset ID
+            reviewer_id: Reviewer user ID
+            limit: Max rows to claim
+            after: Optional (updated_at, id) of the last row claimed before
+
+        Returns:
+            Claimed rows, ordered like the review queue, creator and updater loaded
+        """
+        candidates = (
+            select(DatasetRow.id)
+            .where(
+                DatasetRow.dataset_id == dataset_id,
+                DatasetRow.status == "pending",
+                or_(DatasetRow.leased_by.is_(None), DatasetRow.lease_expires_at <= func.now()),
+            )
+            .order_by(DatasetRow.updated_at.desc(), DatasetRow.id.desc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if after is not None:
+            candidates = candidates.where(
+                tuple_(DatasetRow.updated_at, DatasetRow.id) < tuple_(*after)
+            )
+
+        result = await self.db.execute(
+            update(DatasetRow)
+            .where(DatasetRow.id.in_(candidates.scalar_subquery()))
+            # Set explicitly so the onupdate timestamp is not applied
+            .values(
+                leased_by=reviewer_id,
+                lease_expires_at=func.now() + timedelta(seconds=settings.REVIEW_LEASE_SECONDS),
+                updated_at=DatasetRow.updated_at,
+            )
+            .returning(DatasetRow.id)
+            .execution_options(synchronize_session=False)
+        )
+        row_ids = list(result.scalars().all())
+        if not row_ids:
+            return []
+
+        result = await self.db.execute(
+            select(DatasetRow)
+            .where(DatasetRow.id.in_(row_ids))
+            .options(selectinload(DatasetRow.creator))
+            .options(selectinload(DatasetRow.updater))
+            .order_by(DatasetRow.updated_at.desc(), DatasetRow.id.desc())
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+    async def renew_leases(self, dataset_id: UUID, reviewer_id: UUID) -> None:
+        """
+        Extend a reviewer's active leases on rows of a dataset.
+
+        Args:
+            dataset_id: Dataset ID
+            reviewer_id: Reviewer user ID
+        """
+        await self.db.execute(
+            update(DatasetRow)
+            .where(
+                DatasetRow.leased_by == reviewer_id,
+                DatasetRow.dataset_id == dataset_id,
+                DatasetRow.lease_expires_at > func.now(),
+            )
+            .values(
+                lease_expires_at=func.now() + timedelta(seconds=settings.REVIEW_LEASE_SECONDS),
+                updated_at=DatasetRow.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def release_leases(
+        self, dataset_id: UUID, reviewer_id: UUID, row_ids: list[UUID] | None = None
+    ) -> None:
+        """
+        Release a reviewer's leases on rows of a dataset.
+
+        Args:
+            dataset_id: Dataset ID
+            reviewer_id: Reviewer user ID
+            row_ids: Rows to release, all of the reviewer's rows if None
+        """
+        if row_ids is not None and not row_ids:
+            return
+
+        query = update(DatasetRow).where(
+            DatasetRow.leased_by == reviewer_id, DatasetRow.dataset_id == dataset_id
+        )
+        if row_ids is not None:
+            query = query.where(DatasetRow.id.in_(row_ids))
+
+        await self.db.execute(
+            query.values(
+                leased_by=None, lease_expires_at=None, updated_at=DatasetRow.updated_at
+            ).execution_options(synchronize_session=False)
+        )
+
+    async def get_lease_holder(self, row_id: UUID) -> UUID | None:
+        """
+        Get the reviewer holding an active lease on a row.
+
+        Args:
+            row_id: Row ID
+
+        Returns:
+            Reviewer user ID, or None if the row is not leased
+        """
+        return await self.db.scalar(
+            select(DatasetRow.leased_by).where(
+                DatasetRow.id == row_id, DatasetRow.lease_expires_at > func.now()
+            )
+        )
 
     async def get_pending_rows(
-        self, dataset_id: UUID, page: int = 1, page_size: int = 20
-    ) -> tuple[list[DatasetRow], int]:
+        self,
+        dataset_id: UUID,
+        page: int = 1,
+        page_size: int = 20,
+        after: tuple[datetime, UUID] | None = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> tuple[list[DatasetRow], int | None]:
         """
         Get pending rows for dataset.
 
         Args:
             dataset_id: Dataset ID
-            page: Page number
+            page: Page number (offset pagination)
             page_size: Items per page
+            after: Optional (updated_at, id) of the last row of the previous page
+            count: How to compute the total
 
         Returns:
-            Tuple of (rows, total_count)
+            Tuple of (rows, total_count), total_count is None for CountMode.NONE
         """
-        return await self.get_by_dataset(dataset_id, page, page_size, status="pending")
+        return await self.get_by_dataset(
+            dataset_id, page, page_size, status="pending", after=after, count=count
+        )
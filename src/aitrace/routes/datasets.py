@@ -6,7 +6,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from aitrace.common.database import get_db_session
+from aitrace.common.database import get_db_session, get_read_db_session
 from aitrace.common.dependencies import get_current_user
 from aitrace.models.base import PaginatedResponse
 from aitrace.models.dataset import DatasetCreate, DatasetResponse, DatasetUpdate
@@ -21,7 +21,7 @@ async def list_datasets(
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=100)] = 20,
     user: Annotated[UserResponse, Depends(get_current_user)] = None,
-    db: Annotated[AsyncSession, Depends(get_db_session)] = None,
+    db: Annotated[AsyncSession, Depends(get_read_db_session)] = None,
 ) -> PaginatedResponse:
     """
     List datasets.
@@ -50,7 +50,7 @@ async def list_datasets(
 async def get_dataset(
     dataset_id: UUID,
     user: Annotated[UserResponse, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: Annotated[AsyncSession, Depends(get_read_db_session)],
 ) -> DatasetResponse:
     """
     Get dataset by ID.
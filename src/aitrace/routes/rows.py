@@ -1,24 +1,35 @@
 """Dataset row routes."""
 
+import json
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from aitrace.common.database import get_db_session
+from aitrace.common.csv_stream import MultipartCSVUpload, iter_csv_records
+from aitrace.common.database import get_db_session, get_read_db_session
 from aitrace.common.dependencies import get_current_user
-from aitrace.models.base import PaginatedResponse
+from aitrace.common.exceptions import ValidationException
+from aitrace.common.settings import settings
+from aitrace.models.base import CountMode, PaginatedResponse
 from aitrace.models.row import (
     BulkUpdateStatusRequest,
+    CSVImportOptions,
     CSVImportRequest,
     CSVImportResponse,
     DatasetRowCreate,
     DatasetRowResponse,
     DatasetRowUpdate,
+    ExportFormat,
+    ReviewSessionRequest,
+    ReviewSessionResponse,
+    RowStatus,
+    ThumbnailFormat,
 )
 from aitrace.models.user import UserResponse
+from aitrace.services import row_export, thumbnails
 from aitrace.services.row_service import RowService
 
 router = APIRouter(prefix="/datasets/{dataset_id}/rows", tags=["rows"])
@@ -30,17 +41,24 @@ async def list_rows(
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=100)] = 20,
     status: Annotated[str | None, Query()] = None,
+    cursor: Annotated[str | None, Query()] = None,
+    count: Annotated[CountMode, Query()] = CountMode.EXACT,
     user: Annotated[UserResponse, Depends(get_current_user)] = None,
-    db: Annotated[AsyncSession, Depends(get_db_session)] = None,
+    db: Annotated[AsyncSession, Depends(get_read_db_session)] = None,
 ) -> PaginatedResponse:
     """
     List dataset rows.
 
+    Pass the `next_cursor` of a response as `cursor` to fetch the following
+    page; unlike `page`, its cost does not grow with the page depth.
+
     Args:
         dataset_id: Dataset ID
-        page: Page number
+        page: Page number, ignored when a cursor is given
         page_size: Items per page
         status: Optional status filter
+        cursor: Cursor returned with the previous page
+        count: How to compute the total (exact, estimate or none)
         user: Current user
         db: Database session
 
@@ -48,13 +66,17 @@ async def list_rows(
         Paginated rows
     """
     row_service = RowService(db)
-    rows, total = await row_service.get_by_dataset(dataset_id, page, page_size, status)
+    rows, total, next_cursor = await row_service.get_by_dataset(
+        dataset_id, page, page_size, status, cursor, count
+    )
 
     return PaginatedResponse(
         items=rows,
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
+        count=count,
     )
 
 
@@ -63,16 +85,20 @@ async def get_review_queue(
     dataset_id: UUID,
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Annotated[str | None, Query()] = None,
+    count: Annotated[CountMode, Query()] = CountMode.EXACT,
     user: Annotated[UserResponse, Depends(get_current_user)] = None,
-    db: Annotated[AsyncSession, Depends(get_db_session)] = None,
+    db: Annotated[AsyncSession, Depends(get_read_db_session)] = None,
 ) -> PaginatedResponse:
     """
     Get review queue (pending rows).
 
     Args:
         dataset_id: Dataset ID
-        page: Page number
+        page: Page number, ignored when a cursor is given
         page_size: Items per page
+        cursor: Cursor returned with the previous page
+        count: How to compute the total (exact, estimate or none)
         user: Current user
         db: Database session
 
@@ -80,45 +106,85 @@ async def get_review_queue(
         Paginated pending rows
     """
     row_service = RowService(db)
-    rows, total = await row_service.get_pending_rows(dataset_id, page, page_size)
+    rows, total, next_cursor = await row_service.get_pending_rows(
+        dataset_id, page, page_size, cursor, count
+    )
 
     return PaginatedResponse(
         items=rows,
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
+        count=count,
     )
 
 
-@router.get("/export", response_class=Response)
-async def export_csv(
+@router.get("/export", response_class=StreamingResponse)
+async def export_rows(
     dataset_id: UUID,
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.CSV,
+    status: Annotated[RowStatus | None, Query()] = None,
+    columns: Annotated[list[str] | None, Query()] = None,
     only_reviewed: Annotated[bool, Query()] = True,
     user: Annotated[UserResponse, Depends(get_current_user)] = None,
-    db: Annotated[AsyncSession, Depends(get_db_session)] = None,
-) -> Response:
+    db: Annotated[AsyncSession, Depends(get_read_db_session)] = None,
+) -> StreamingResponse:
     """
-    Export dataset rows to CSV.
+    Export dataset rows as CSV, JSONL or Parquet.
 
     Args:
         dataset_id: Dataset ID
-        only_reviewed: Only export reviewed rows (default: True)
+        export_format: Output format
+        status: Only export rows with this status (overrides only_reviewed)
+        columns: Columns to export, repeated once per column (default: all)
+        only_reviewed: Only export reviewed rows when no status is given (default: True)
         user: Current user
         db: Database session
 
     Returns:
-        CSV file
+        Streamed export file
     """
+    if status is None and only_reviewed:
+        status = RowStatus.REVIEWED
+
     row_service = RowService(db)
-    csv_content = await row_service.export_csv(dataset_id, only_reviewed)
+    chunks = await row_service.export_rows(dataset_id, export_format, status, columns)
 
-    return Response(
-        content=csv_content,
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename=dataset_{dataset_id}.csv"},
+    filename = f"dataset_{dataset_id}.{export_format.value}"
+    return StreamingResponse(
+        chunks,
+        media_type=row_export.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
+@router.post("/review-session", response_model=ReviewSessionResponse)
+async def review_session(
+    dataset_id: UUID,
+    data: ReviewSessionRequest,
+    user: Annotated[UserResponse, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db_session)],
+) -> ReviewSessionResponse:
+    """
+    Submit review decisions and get the next pending rows in one round-trip.
+
+    Start with no continuation token, then send the token of each response
+    with the decisions taken on the rows delivered so far.
+
+    Args:
+        dataset_id: Dataset ID
+        data: Decisions, number of rows to fetch and continuation token
+        user: Current user
+        db: Database session
+
+    Returns:
+        Next pending rows, continuation token and pending rows left
+    """
+    row_service = RowService(db)
+    return await row_service.review_session(dataset_id, data, user.id)
+
+
 @router.get("/{row_id}", response_model=DatasetRowResponse)
 async def get_row(
     dataset_id: UUID,
@@ -142,6 +208,39 @@ async def get_row(
     return await row_service.get_by_id(row_id)
 
 
+@router.get("/{row_id}/thumbnail", response_class=Response)
+async def get_row_thumbnail(
+    dataset_id: UUID,
+    row_id: UUID,
+    size: Annotated[int, Query()] = 256,
+    thumbnail_format: Annotated[ThumbnailFormat, Query(alias="format")] = ThumbnailFormat.WEBP,
+    user: Annotated[UserResponse, Depends(get_current_user)] = None,
+    db: Annotated[AsyncSession, Depends(get_read_db_session)] = None,
+) -> Response:
+    """
+    Get a resized copy of a row's image.
+
+    Args:
+        dataset_id: Dataset ID
+        row_id: Row ID
+        size: Longest edge in pixels, one of THUMBNAIL_SIZES
+        thumbnail_format: Image format
+        user: Current user
+        db: Database session
+
+    Returns:
+        Thumbnail image
+    """
+    row_service = RowService(db)
+    content = await row_service.get_thumbnail(row_id, size, thumbnail_format)
+
+    return Response(
+        content,
+        media_type=thumbnails.MEDIA_TYPES[thumbnail_format],
+        headers={"Cache-Control": f"private, max-age={settings.THUMBNAIL_CACHE_MAX_AGE_SECONDS}"},
+    )
+
+
 @router.post("", response_model=DatasetRowResponse, status_code=201)
 async def create_row(
     dataset_id: UUID,
@@ -207,7 +306,7 @@ async def delete_row(
         db: Database session
     """
     row_service = RowService(db)
-    await row_service.delete(row_id)
+    await row_service.delete(row_id, user.id)
 
 
 @router.post("/bulk/update-status", status_code=204)
@@ -227,7 +326,7 @@ async def bulk_update_status(
         db: Database session
     """
     row_service = RowService(db)
-    await row_service.bulk_update_status(data)
+    await row_service.bulk_update_status(data, user.id)
 
 
 @router.post("/bulk/delete", status_code=204)
@@ -247,7 +346,7 @@ async def bulk_delete(
         db: Database session
     """
     row_service = RowService(db)
-    await row_service.bulk_delete(row_ids)
+    await row_service.bulk_delete(row_ids, user.id)
 
 
 @router.post("/import", response_model=CSVImportResponse)
@@ -271,3 +370,44 @@ async def import_csv(
     """
     row_service = RowService(db)
     return await row_service.import_csv(dataset_id, data, user.id)
+
+
+@router.post("/import/upload", response_model=CSVImportResponse)
+async def import_csv_upload(
+    dataset_id: UUID,
+    request: Request,
+    user: Annotated[UserResponse, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db_session)],
+) -> CSVImportResponse:
+    """
+    Import rows from a streamed multipart CSV upload.
+
+    The form must send ``column_mapping`` (JSON object) and optionally
+    ``mark_all_pending`` and ``mode`` before the ``file`` part. The file is
+    parsed and imported as it arrives, so memory use does not grow with its size.
+
+    Args:
+        dataset_id: Dataset ID
+        request: FastAPI request
+        user: Current user
+        db: Database session
+
+    Returns:
+        Import summary
+    """
+    upload = MultipartCSVUpload(request)
+    fields = await upload.read_fields()
+
+    try:
+        options = CSVImportOptions(
+            column_mapping=json.loads(fields.get("column_mapping", "{}")),
+            mark_all_pending=fields.get("mark_all_pending", "false").lower() == "true",
+            mode=fields.get("mode", "insert"),
+        )
+    except ValueError as e:
+        raise ValidationException("Invalid import options", details=str(e))
+
+    row_service = RowService(db)
+    return await row_service.import_csv_stream(
+        dataset_id, iter_csv_records(upload.file_chunks()), options, user.id
+    )
@@ -84,7 +84,7 @@ async def initialize_setup(
     user = User(
         id=uuid4(),
         email=data.email.lower(),
-        password_hash=auth_service.hash_password(data.password),
+        password_hash=await auth_service.hash_password(data.password),
         role="admin",
         team_id=team_response.id,
         must_reset_pwd=False,  # First admin doesn't need to reset
@@ -4,10 +4,11 @@ import secrets
 from datetime import datetime, timedelta
 from uuid import UUID, uuid4
 
-import bcrypt
 from jose import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from aitrace.common import password_hashing
+from aitrace.common.cache import user_cache
 from aitrace.common.exceptions import UnauthorizedException, ValidationException
 from aitrace.common.settings import settings
 from aitrace.models.user import User
@@ -22,9 +23,9 @@ class AuthService:
         self.db = db
         self.user_repo = UserRepository(db)
 
-    def hash_password(self, password: str) -> str:
+    async def hash_password(self, password: str) -> str:
         """
-        Hash password using bcrypt.
+        Hash password using bcrypt, off the event loop.
 
         Args:
             password: Plain password
@@ -32,13 +33,11 @@ class AuthService:
         Returns:
             Hashed password
         """
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        return await password_hashing.hash_password(password)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
-        Verify password using bcrypt.
+        Verify password using bcrypt, off the event loop.
 
         Args:
             plain_password: Plain password
@@ -47,7 +46,7 @@ class AuthService:
         Returns:
             True if password matches
         """
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        return await password_hashing.verify_password(plain_password, hashed_password)
 
     def create_access_token(self, user_id: UUID, remember_me: bool = False) -> str:
         """
@@ -90,7 +89,7 @@ class AuthService:
         """
         user = await self.user_repo.get_by_email(email)
 
-        if not user or not self.verify_password(password, user.password_hash):
+        if not user or not await self.verify_password(password, user.password_hash):
             raise UnauthorizedException("Invalid email or password")
 
         token = self.create_access_token(user.id, remember_me)
@@ -116,13 +115,14 @@ class AuthService:
         if not user:
             raise UnauthorizedException("User not found")
 
-        if not self.verify_password(old_password, user.password_hash):
+        if not await self.verify_password(old_password, user.password_hash):
             raise ValidationException("Old password is incorrect")
 
-        user.password_hash = self.hash_password(new_password)
+        user.password_hash = await self.hash_password(new_password)
         user.must_reset_pwd = False
 
         await self.user_repo.update(user)
+        user_cache.invalidate_after_commit(user_id, self.db)
 
     async def reset_password(self, user_id: UUID, new_password: str) -> None:
         """
@@ -137,10 +137,11 @@ class AuthService:
         if not user:
             raise UnauthorizedException("User not found")
 
-        user.password_hash = self.hash_password(new_password)
+        user.password_hash = await self.hash_password(new_password)
         user.must_reset_pwd = False
 
         await self.user_repo.update(user)
+        user_cache.invalidate_after_commit(user_id, self.db)
 
     def generate_temp_password(self) -> str:
         """
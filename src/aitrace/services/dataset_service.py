@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from aitrace.common.exceptions import DuplicateException, NotFoundException
 from aitrace.models.dataset import DatasetCreate, DatasetResponse, DatasetUpdate, Dataset
+from aitrace.models.row import RowStatus
 from aitrace.repositories.dataset_repository import DatasetRepository
 from aitrace.repositories.schema_repository import SchemaRepository
 
@@ -37,15 +38,9 @@ class DatasetService:
         if not dataset:
             raise NotFoundException("Dataset not found")
 
-        # Get counts
-        rows_count = await self.dataset_repo.get_rows_count(dataset_id)
-        pending_count = await self.dataset_repo.get_pending_count(dataset_id)
+        counts = await self.dataset_repo.get_status_counts([dataset_id])
 
-        response = DatasetResponse.model_validate(dataset)
-        response.rows_count = rows_count
-        response.pending_count = pending_count
-
-        return response
+        return self._to_response(dataset, counts[dataset_id])
 
     async def get_by_team(
         self, team_id: UUID, page: int = 1, page_size: int = 20
@@ -62,13 +57,9 @@ class DatasetService:
             Tuple of (datasets, total_count)
         """
         datasets, total = await self.dataset_repo.get_by_team(team_id, page, page_size)
+        counts = await self.dataset_repo.get_status_counts([dataset.id for dataset in datasets])
 
-        responses = []
-        for dataset in datasets:
-            response = DatasetResponse.model_validate(dataset)
-            response.rows_count = await self.dataset_repo.get_rows_count(dataset.id)
-            response.pending_count = await self.dataset_repo.get_pending_count(dataset.id)
-            responses.append(response)
+        responses = [self._to_response(dataset, counts[dataset.id]) for dataset in datasets]
 
         return responses, total
 
@@ -112,11 +103,7 @@ class DatasetService:
 
         dataset = await self.dataset_repo.create(dataset)
 
-        response = DatasetResponse.model_validate(dataset)
-        response.rows_count = 0
-        response.pending_count = 0
-
-        return response
+        return self._to_response(dataset, {})
 
     async def update(
         self, dataset_id: UUID, data: DatasetUpdate, updated_by: UUID
@@ -156,13 +143,26 @@ class DatasetService:
 
         dataset = await self.dataset_repo.update(dataset)
 
-        # Get counts
-        rows_count = await self.dataset_repo.get_rows_count(dataset_id)
-        pending_count = await self.dataset_repo.get_pending_count(dataset_id)
+        counts = await self.dataset_repo.get_status_counts([dataset_id])
 
+        return self._to_response(dataset, counts[dataset_id])
+
+    @staticmethod
+    def _to_response(dataset: Dataset, status_counts: dict[str, int]) -> DatasetResponse:
+        """
+        Build a dataset response with its row counts.
+
+        Args:
+            dataset: Dataset
+            status_counts: Row count per status
+
+        Returns:
+            Dataset response
+        """
         response = DatasetResponse.model_validate(dataset)
-        response.rows_count = rows_count
-        response.pending_count = pending_count
+        response.status_counts = status_counts
+        response.rows_count = status_counts.get(RowStatus.REVIEWED.value, 0)
+        response.pending_count = status_counts.get(RowStatus.PENDING.value, 0)
 
         return response
 
@@ -182,3 +182,7 @@ class DatasetService:
             raise NotFoundException("Dataset not found")
 
         await self.dataset_repo.delete(dataset_id)
+
+    async def compact_row_counts(self) -> None:
+        """Compact the per-dataset row count deltas."""
+        await self.dataset_repo.compact_row_counts()
@@ -0,0 +1,384 @@
+"""Row export formats."""
+
+import io
+import json
+from collections.abc import AsyncIterator, Iterable
+from csv import DictWriter
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from aitrace.common.exceptions import ValidationException
+from aitrace.common.settings import settings
+from aitrace.models.row import ExportFormat
+from aitrace.models.schema import FieldType, SchemaField
+
+
+class ColumnType(str, Enum):
+    """Export column type."""
+
+    STRING = "string"
+    BOOLEAN = "boolean"
+    INTEGER = "integer"
+    FLOAT = "float"
+    TIMESTAMP = "timestamp"
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """Column of an export, either a schema field or a system column."""
+
+    name: str
+    type: ColumnType
+    field_id: str | None = None
+
+
+_TRUE_VALUES = {"true", "1", "yes", "y", "t"}
+_FALSE_VALUES = {"false", "0", "no", "n", "f"}
+
+# Integer columns are int64 in Parquet
+_INTEGER_RANGE = range(-(2**63), 2**63)
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.JSONL: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _field_column_type(field: SchemaField) -> ColumnType:
+    """
+    Map a schema field to its export column type.
+
+    Args:
+        field: Schema field
+
+    Returns:
+        Column type
+    """
+    if field.type == FieldType.BOOLEAN.value:
+        return ColumnType.BOOLEAN
+    if field.type == FieldType.NUMERIC.value:
+        config = field.config or {}
+        return ColumnType.FLOAT if config.get("decimal") else ColumnType.INTEGER
+    return ColumnType.STRING
+
+
+def build_export_columns(
+    fields: Iterable[SchemaField], selected: list[str] | None = None
+) -> list[ExportColumn]:
+    """
+    Build the export columns for a schema.
+
+    Args:
+        fields: Schema fields, in schema order
+        selected: Optional column names to project, in output order
+
+    Returns:
+        Export columns
+
+    Raises:
+        ValidationException: If a selected column does not exist
+    """
+    columns = [ExportColumn("image_url", ColumnType.STRING)]
+    columns += [
+        ExportColumn(field.name, _field_column_type(field), str(field.id)) for field in fields
+    ]
+    columns += [
+        ExportColumn("status", ColumnType.STRING),
+        ExportColumn("created_at", ColumnType.TIMESTAMP),
+        ExportColumn("updated_at", ColumnType.TIMESTAMP),
+        ExportColumn("updated_by", ColumnType.STRING),
+    ]
+
+    if not selected:
+        return columns
+
+    by_name = {column.name: column for column in columns}
+    unknown = [name for name in selected if name not in by_name]
+    if unknown:
+        raise ValidationException(
+            "Unknown export columns", details={"columns": unknown, "available": list(by_name)}
+        )
+
+    # Keep the requested order, ignoring repeated names
+    return [by_name[name] for name in dict.fromkeys(selected)]
+
+
+def _coerce_integer(value: Any) -> int | None:
+    """
+    Coerce a stored value to an integer.
+
+    Args:
+        value: Stored value, neither None nor a bool
+
+    Returns:
+        Integer, or None if the value is not integral
+    """
+    # Parsed exactly; going through float loses precision above 2**53
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        pass  # Integral floats such as "3.0" are accepted below
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(number) if number.is_integer() else None
+
+
+def coerce_value(value: Any, column_type: ColumnType) -> Any:
+    """
+    Coerce a stored value to the column type.
+
+    Values that cannot be represented in the column type are exported as null.
+
+    Args:
+        value: Stored value
+        column_type: Target column type
+
+    Returns:
+        Typed value or None
+    """
+    if value is None or value == "":
+        return None
+
+    if column_type == ColumnType.BOOLEAN:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE_VALUES:
+            return True
+        if text in _FALSE_VALUES:
+            return False
+        return None
+
+    if column_type in (ColumnType.INTEGER, ColumnType.FLOAT):
+        if isinstance(value, bool):
+            return None
+        if column_type == ColumnType.INTEGER:
+            integer = _coerce_integer(value)
+            return integer if integer is not None and integer in _INTEGER_RANGE else None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    if column_type == ColumnType.TIMESTAMP:
+        return value
+
+    return value if isinstance(value, str) else str(value)
+
+
+def _row_values(row: Any, columns: list[ExportColumn], typed: bool) -> dict[str, Any]:
+    """
+    Extract the exported values of a row.
+
+    Args:
+        row: Row from DatasetRowRepository.stream_for_export
+        columns: Export columns
+        typed: Coerce field values to their column type
+
+    Returns:
+        Column name -> value
+    """
+    data = row.data or {}
+    system = {
+        "image_url": row.image_url,
+        "status": row.status,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "updated_by": row.updated_by_email,
+    }
+
+    values = {}
+    for column in columns:
+        if column.field_id is None:
+            values[column.name] = system[column.name]
+        elif typed:
+            values[column.name] = coerce_value(data.get(column.field_id), column.type)
+        else:
+            values[column.name] = data.get(column.field_id, "")
+    return values
+
+
+async def write_csv(rows: AsyncIterator[Any], columns: list[ExportColumn]) -> AsyncIterator[str]:
+    """
+    Write rows as CSV.
+
+    Field values are written as stored, like the CSV import reads them.
+
+    Args:
+        rows: Exported rows
+        columns: Export columns
+
+    Yields:
+        CSV content chunks
+    """
+    output = io.StringIO()
+    writer = DictWriter(output, fieldnames=[column.name for column in columns])
+    writer.writeheader()
+
+    async for row in rows:
+        values = _row_values(row, columns, typed=False)
+        for name, value in values.items():
+            if isinstance(value, datetime):
+                values[name] = value.isoformat()
+            elif value is None:
+                values[name] = ""
+        writer.writerow(values)
+
+        if output.tell() >= settings.EXPORT_CHUNK_SIZE:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+
+    yield output.getvalue()
+
+
+async def write_jsonl(rows: AsyncIterator[Any], columns: list[ExportColumn]) -> AsyncIterator[str]:
+    """
+    Write rows as JSON Lines, typed from the schema.
+
+    Args:
+        rows: Exported rows
+        columns: Export columns
+
+    Yields:
+        JSONL content chunks
+    """
+    lines: list[str] = []
+    size = 0
+
+    async for row in rows:
+        values = _row_values(row, columns, typed=True)
+        line = json.dumps(values, default=lambda v: v.isoformat(), ensure_ascii=False) + "\n"
+        lines.append(line)
+        size += len(line)
+
+        if size >= settings.EXPORT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines.clear()
+            size = 0
+
+    if lines:
+        yield "".join(lines)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet footers record absolute offsets, so report the total written
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _import_pyarrow() -> Any:
+    """
+    Import pyarrow, which is an optional dependency.
+
+    Returns:
+        The pyarrow module
+
+    Raises:
+        ValidationException: If pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ValidationException(
+            "Parquet export is not available", details="Install the 'export' extra (pyarrow)"
+        ) from e
+    return pyarrow
+
+
+def check_format_available(export_format: ExportFormat) -> None:
+    """
+    Check that the dependencies of an export format are installed.
+
+    Args:
+        export_format: Export format
+
+    Raises:
+        ValidationException: If the format cannot be produced
+    """
+    if export_format == ExportFormat.PARQUET:
+        _import_pyarrow()
+
+
+async def write_parquet(
+    rows: AsyncIterator[Any], columns: list[ExportColumn]
+) -> AsyncIterator[bytes]:
+    """
+    Write rows as Parquet, typed from the schema, one row group at a time.
+
+    Args:
+        rows: Exported rows
+        columns: Export columns
+
+    Yields:
+        Parquet content chunks
+    """
+    pa = _import_pyarrow()
+
+    arrow_types = {
+        ColumnType.STRING: pa.string(),
+        ColumnType.BOOLEAN: pa.bool_(),
+        ColumnType.INTEGER: pa.int64(),
+        ColumnType.FLOAT: pa.float64(),
+        ColumnType.TIMESTAMP: pa.timestamp("us"),
+    }
+    schema = pa.schema([pa.field(column.name, arrow_types[column.type]) for column in columns])
+
+    sink = _ChunkSink()
+    writer = pa.parquet.ParquetWriter(sink, schema)
+    batch: dict[str, list[Any]] = {column.name: [] for column in columns}
+    batch_size = 0
+
+    try:
+        async for row in rows:
+            for name, value in _row_values(row, columns, typed=True).items():
+                batch[name].append(value)
+            batch_size += 1
+
+            if batch_size >= settings.EXPORT_PARQUET_ROW_GROUP_SIZE:
+                writer.write_table(pa.Table.from_pydict(batch, schema=schema))
+                batch = {column.name: [] for column in columns}
+                batch_size = 0
+                yield sink.drain()
+
+        if batch_size:
+            writer.write_table(pa.Table.from_pydict(batch, schema=schema))
+    finally:
+        writer.close()
+
+    yield sink.drain()
+
+
+WRITERS = {
+    ExportFormat.CSV: write_csv,
+    ExportFormat.JSONL: write_jsonl,
+    ExportFormat.PARQUET: write_parquet,
+}
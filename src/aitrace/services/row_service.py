@@ -1,27 +1,130 @@
 """Dataset row service."""
 
+import asyncio
 import hashlib
 import io
-from csv import DictReader, DictWriter
+import logging
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from csv import DictReader
+from dataclasses import dataclass, field
 from typing import Any
 from uuid import UUID, uuid4
 
-import httpx
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from aitrace.common.exceptions import DuplicateException, NotFoundException, ValidationException
+from aitrace.common.exceptions import (
+    ConflictException,
+    DuplicateException,
+    NotFoundException,
+    ValidationException,
+)
+from aitrace.common.fetch_limiter import FetchLimiter
+from aitrace.common.http_client import http_client_wrapper
+from aitrace.common.pagination import decode_cursor, encode_cursor
+from aitrace.common.settings import settings
+from aitrace.models.base import CountMode
+from aitrace.models.image_hash_cache import ImageHashCache
 from aitrace.models.row import (
     BulkUpdateStatusRequest,
+    CSVImportOptions,
     CSVImportRequest,
     CSVImportResponse,
     DatasetRow,
     DatasetRowCreate,
     DatasetRowResponse,
     DatasetRowUpdate,
+    ExportFormat,
+    ImportMode,
+    ReviewAction,
+    ReviewSessionRequest,
+    ReviewSessionResponse,
+    RowStatus,
+    ThumbnailFormat,
 )
 from aitrace.repositories.dataset_repository import DatasetRepository
+from aitrace.repositories.image_hash_cache_repository import ImageHashCacheRepository
 from aitrace.repositories.row_repository import DatasetRowRepository
 from aitrace.repositories.schema_repository import SchemaRepository
+from aitrace.services import row_export, thumbnails
+
+logger = logging.getLogger(__name__)
+
+# Content types accepted when IMAGE_VALIDATE_CONTENT is enabled
+_ALLOWED_CONTENT_TYPES = ("image/", "application/octet-stream", "binary/octet-stream")
+
+# Leading bytes of supported image formats
+_IMAGE_SIGNATURES = (
+    b"\xff\xd8\xff",  # JPEG
+    b"\x89PNG\r\n\x1a\n",  # PNG
+    b"GIF87a",
+    b"GIF89a",
+    b"BM",  # BMP
+    b"II*\x00",  # TIFF (little endian)
+    b"MM\x00*",  # TIFF (big endian)
+)
+
+
+def _is_image(head: bytes) -> bool:
+    """
+    Check whether content starts with a known image signature.
+
+    Args:
+        head: First bytes of the content
+
+    Returns:
+        True if the content looks like an image
+    """
+    if head.startswith(_IMAGE_SIGNATURES):
+        return True
+
+    # WebP (RIFF container) and AVIF/HEIC (ISO base media file)
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return True
+
+    return head[4:12] in (b"ftypavif", b"ftypavis", b"ftypheic", b"ftypheix", b"ftypmif1")
+
+
+async def _iterate(
+    records: Iterable[dict[str, str | None]],
+) -> AsyncIterator[dict[str, str | None]]:
+    """Adapt an in-memory iterable of CSV records to the streaming import."""
+    for record in records:
+        yield record
+
+
+@dataclass
+class _ImageFetch:
+    """Result of downloading and hashing an image."""
+
+    url: str
+    image_hash: str
+    etag: str | None = None
+    last_modified: str | None = None
+    content: bytes | None = None  # Only kept when thumbnails are rendered from it
+
+    def as_cache_entry(self) -> dict[str, str | None]:
+        """Get values for the URL hash cache."""
+        return {
+            "url": self.url,
+            "image_hash": self.image_hash,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+
+@dataclass
+class _ImportItem:
+    """A CSV row on its way through the import pipeline."""
+
+    line: int
+    image_url: str = ""
+    data: dict[str, Any] = field(default_factory=dict)
+    image_hash: str | None = None
+    error: str | None = None
+    cached: ImageHashCache | None = None
+    fetched: _ImageFetch | None = None
 
 
 class RowService:
@@ -33,11 +136,16 @@ class RowService:
         self.row_repo = DatasetRowRepository(db)
         self.dataset_repo = DatasetRepository(db)
         self.schema_repo = SchemaRepository(db)
+        self.hash_cache_repo = ImageHashCacheRepository(db)
 
     async def compute_image_hash(self, image_url: str) -> str:
         """
         Compute MD5 hash of image content.
 
+        The URL hash cache is consulted first, so the image is only downloaded when
+        there is no unexpired entry for the URL (or, with revalidation enabled, when
+        the server reports that it changed).
+
         Args:
             image_url: Image URL
 
@@ -45,21 +153,195 @@ class RowService:
             MD5 hash
 
         Raises:
-            ValidationException: If image cannot be fetched
+            ValidationException: If image cannot be fetched, is too large or is not an image
+        """
+        cached = None
+        if settings.IMAGE_HASH_CACHE_ENABLED:
+            entries = await self.hash_cache_repo.get_many(
+                [image_url], settings.IMAGE_HASH_CACHE_TTL_SECONDS
+            )
+            cached = entries.get(image_url)
+            if cached and not settings.IMAGE_HASH_CACHE_REVALIDATE:
+                return cached.image_hash
+
+        fetched = await self._download_image_hash(
+            image_url, cached, keep_content=settings.THUMBNAILS_ON_IMPORT
+        )
+        await self._render_thumbnails(fetched)
+        await self._store_cached_hashes([fetched])
+
+        return fetched.image_hash
+
+    async def _download_image_hash(
+        self,
+        image_url: str,
+        cached: ImageHashCache | None = None,
+        keep_content: bool = False,
+    ) -> _ImageFetch:
+        """
+        Download image and compute its MD5 hash.
+
+        The image is streamed and hashed chunk by chunk, so memory use stays near
+        IMAGE_HASH_CHUNK_SIZE regardless of the image size, unless the content is
+        kept. When a cache entry is given, the request is made conditional on its
+        validators and a 304 response reuses the cached hash.
+
+        Args:
+            image_url: Image URL
+            cached: Cache entry to revalidate
+            keep_content: Return the downloaded content along with its hash
+
+        Returns:
+            Fetch result
+
+        Raises:
+            ValidationException: If image cannot be fetched, is too large or is not an image
         """
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(image_url)
+            async with http_client_wrapper.client.stream(
+                "GET", image_url, headers=headers
+            ) as response:
+                if cached is not None and response.status_code == 304:
+                    return _ImageFetch(
+                        url=image_url,
+                        image_hash=cached.image_hash,
+                        etag=response.headers.get("etag", cached.etag),
+                        last_modified=response.headers.get("last-modified", cached.last_modified),
+                    )
+
                 response.raise_for_status()
 
+                content_length = response.headers.get("content-length", "")
+                if content_length.isdigit() and int(content_length) > settings.IMAGE_MAX_BYTES:
+                    raise ValueError(f"image exceeds the {settings.IMAGE_MAX_BYTES} byte limit")
+
+                if settings.IMAGE_VALIDATE_CONTENT:
+                    content_type = response.headers.get("content-type", "").lower()
+                    if content_type and not content_type.startswith(_ALLOWED_CONTENT_TYPES):
+                        raise ValueError(f"unexpected content type '{content_type}'")
+
                 # Compute MD5 hash
                 hash_md5 = hashlib.md5()
-                hash_md5.update(response.content)
-
-                return hash_md5.hexdigest()
+                size = 0
+                chunks = []
+
+                async for chunk in response.aiter_bytes(settings.IMAGE_HASH_CHUNK_SIZE):
+                    if size == 0 and settings.IMAGE_VALIDATE_CONTENT and not _is_image(chunk):
+                        raise ValueError("content is not a recognized image format")
+
+                    size += len(chunk)
+                    if size > settings.IMAGE_MAX_BYTES:
+                        raise ValueError(f"image exceeds the {settings.IMAGE_MAX_BYTES} byte limit")
+
+                    hash_md5.update(chunk)
+                    if keep_content:
+                        chunks.append(chunk)
+
+                return _ImageFetch(
+                    url=image_url,
+                    image_hash=hash_md5.hexdigest(),
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                    content=b"".join(chunks) if keep_content else None,
+                )
         except Exception as e:
             raise ValidationException(f"Image could not be loaded: {str(e)}")
 
+    async def _store_cached_hashes(self, fetches: list[_ImageFetch]) -> None:
+        """
+        Store fetch results in the URL hash cache.
+
+        The entries are written and committed in a short transaction of their own,
+        so the cache rows are not locked for the rest of the caller's transaction
+        (e.g. a whole CSV import). Failures are logged rather than raised; the
+        images are then downloaded again next time.
+
+        Args:
+            fetches: Fetch results
+        """
+        if not settings.IMAGE_HASH_CACHE_ENABLED or not fetches:
+            return
+
+        try:
+            async with AsyncSession(self.db.bind) as session:
+                await ImageHashCacheRepository(session).upsert_many(
+                    [fetched.as_cache_entry() for fetched in fetches]
+                )
+                await session.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"Image hash cache not updated: {str(e)}")
+
+    async def evict_expired_image_hashes(self) -> None:
+        """Delete URL hash cache entries older than IMAGE_HASH_CACHE_TTL_SECONDS."""
+        await self.hash_cache_repo.delete_expired(settings.IMAGE_HASH_CACHE_TTL_SECONDS)
+
+    async def _render_thumbnails(self, fetched: _ImageFetch) -> None:
+        """
+        Render the thumbnails of an image downloaded for hashing, then drop its content.
+
+        Args:
+            fetched: Fetch result, with its content when it was kept
+        """
+        if fetched.content is not None:
+            content, fetched.content = fetched.content, None
+            await thumbnails.prerender(fetched.image_hash, fetched.url, content)
+
+    async def get_thumbnail(
+        self, row_id: UUID, size: int, thumbnail_format: ThumbnailFormat
+    ) -> bytes:
+        """
+        Get a thumbnail of a row's image.
+
+        Thumbnails are cached on disk by image hash. On a miss the source image
+        is downloaded once and every size and format is rendered from it.
+
+        Args:
+            row_id: Row ID
+            size: Longest edge in pixels, one of THUMBNAIL_SIZES
+            thumbnail_format: Thumbnail format
+
+        Returns:
+            Thumbnail content
+
+        Raises:
+            NotFoundException: If row not found
+            ValidationException: If the size is not offered or the image cannot be resized
+            ConflictException: If the image no longer matches the row's hash
+        """
+        if size not in settings.THUMBNAIL_SIZES:
+            raise ValidationException(
+                f"Thumbnail size must be one of {', '.join(map(str, settings.THUMBNAIL_SIZES))}"
+            )
+        thumbnails.check_available()
+
+        row = await self.row_repo.get_by_id(row_id)
+        if not row:
+            raise NotFoundException("Row not found")
+
+        image_hash, image_url = row.image_hash, row.image_url
+
+        # Return the connection to the pool before a possibly slow download and resize
+        await self.db.commit()
+
+        # Thumbnails are shared by every row with the same hash, so content that no
+        # longer matches it must not be cached under it
+        async def load() -> bytes:
+            fetched = await self._download_image_hash(image_url, keep_content=True)
+            if fetched.image_hash != image_hash or fetched.content is None:
+                raise ConflictException(
+                    "The image changed since the row was saved; update the row to refresh it"
+                )
+            return fetched.content
+
+        return await thumbnails.get_thumbnail(image_hash, size, thumbnail_format, load)
+
     def calculate_status(self, data: dict[str, Any], required_fields: list[str]) -> str:
         """
         Calculate row status based on required fields.
@@ -80,6 +362,21 @@ class RowService:
 
         return "reviewed"
 
+    async def _check_lease(self, row_id: UUID, user_id: UUID) -> None:
+        """
+        Check that a row is not leased to another reviewer.
+
+        Args:
+            row_id: Row ID
+            user_id: User about to change the row
+
+        Raises:
+            ConflictException: If another reviewer holds the row
+        """
+        holder = await self.row_repo.get_lease_holder(row_id)
+        if holder is not None and holder != user_id:
+            raise ConflictException("This row is being reviewed by another user")
+
     async def get_by_id(self, row_id: UUID) -> DatasetRowResponse:
         """
         Get row by ID.
@@ -101,52 +398,80 @@ class RowService:
         return DatasetRowResponse.model_validate(row)
 
     async def get_by_dataset(
-        self, dataset_id: UUID, page: int = 1, page_size: int = 20, status: str | None = None
-    ) -> tuple[list[DatasetRowResponse], int]:
+        self,
+        dataset_id: UUID,
+        page: int = 1,
+        page_size: int = 20,
+        status: str | None = None,
+        cursor: str | None = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> tuple[list[DatasetRowResponse], int | None, str | None]:
         """
         Get rows by dataset.
 
         Args:
             dataset_id: Dataset ID
-            page: Page number
+            page: Page number, ignored when a cursor is given
             page_size: Items per page
             status: Optional status filter
+            cursor: Optional cursor returned with the previous page
+            count: How to compute the total
 
         Returns:
-            Tuple of (rows, total_count)
-        """
-        rows, total = await self.row_repo.get_by_dataset(dataset_id, page, page_size, status)
+            Tuple of (rows, total_count, next_cursor)
 
-        # Convert to response models with email fields
-        responses = []
-        for r in rows:
-            response = DatasetRowResponse.model_validate(r)
-            # Add email fields from relationships
-            if r.creator:
-                response.created_by_email = r.creator.email
-            if r.updater:
-                response.updated_by_email = r.updater.email
-            responses.append(response)
+        Raises:
+            ValidationException: If the cursor is invalid
+        """
+        after = decode_cursor(cursor) if cursor else None
+        rows, total = await self.row_repo.get_by_dataset(
+            dataset_id, page, page_size, status, after, count
+        )
 
-        return responses, total
+        return self._to_responses(rows), total, self._next_cursor(rows, page_size)
 
     async def get_pending_rows(
-        self, dataset_id: UUID, page: int = 1, page_size: int = 20
-    ) -> tuple[list[DatasetRowResponse], int]:
+        self,
+        dataset_id: UUID,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: str | None = None,
+        count: CountMode = CountMode.EXACT,
+    ) -> tuple[list[DatasetRowResponse], int | None, str | None]:
         """
         Get pending rows for dataset.
 
         Args:
             dataset_id: Dataset ID
-            page: Page number
+            page: Page number, ignored when a cursor is given
             page_size: Items per page
+            cursor: Optional cursor returned with the previous page
+            count: How to compute the total
 
         Returns:
-            Tuple of (rows, total_count)
+            Tuple of (rows, total_count, next_cursor)
+
+        Raises:
+            ValidationException: If the cursor is invalid
         """
-        rows, total = await self.row_repo.get_pending_rows(dataset_id, page, page_size)
+        after = decode_cursor(cursor) if cursor else None
+        rows, total = await self.row_repo.get_pending_rows(
+            dataset_id, page, page_size, after, count
+        )
+
+        return self._to_responses(rows), total, self._next_cursor(rows, page_size)
 
-        # Convert to response models with email fields
+    @staticmethod
+    def _to_responses(rows: list[DatasetRow]) -> list[DatasetRowResponse]:
+        """
+        Convert rows to response models with email fields.
+
+        Args:
+            rows: Rows with creator and updater loaded
+
+        Returns:
+            Row responses
+        """
         responses = []
         for r in rows:
             response = DatasetRowResponse.model_validate(r)
@@ -157,7 +482,24 @@ class RowService:
                 response.updated_by_email = r.updater.email
             responses.append(response)
 
-        return responses, total
+        return responses
+
+    @staticmethod
+    def _next_cursor(rows: list[DatasetRow], page_size: int) -> str | None:
+        """
+        Build the cursor of the page following `rows`.
+
+        Args:
+            rows: Rows of the current page
+            page_size: Requested page size
+
+        Returns:
+            Cursor, or None if this was the last page
+        """
+        if len(rows) < page_size:
+            return None
+        last = rows[-1]
+        return encode_cursor(last.updated_at, last.id)
 
     async def create(
         self, dataset_id: UUID, data: DatasetRowCreate, created_by: UUID
@@ -230,6 +572,7 @@ class RowService:
 
         Raises:
             NotFoundException: If row not found
+            ConflictException: If the row is leased by another reviewer
             DuplicateException: If image hash already exists
             ValidationException: If image invalid
         """
@@ -238,6 +581,8 @@ class RowService:
         if not row:
             raise NotFoundException("Row not found")
 
+        await self._check_lease(row_id, updated_by)
+
         # Get schema for status calculation
         dataset = await self.dataset_repo.get_by_id(row.dataset_id)
         schema = await self.schema_repo.get_by_id_with_fields(dataset.schema_id)
@@ -265,45 +610,148 @@ class RowService:
             row.status = data.status.value
 
         row.updated_by = updated_by
+        row.leased_by = None
+        row.lease_expires_at = None
 
         row = await self.row_repo.update(row)
 
         return DatasetRowResponse.model_validate(row)
 
-    async def delete(self, row_id: UUID) -> None:
+    async def delete(self, row_id: UUID, user_id: UUID) -> None:
         """
         Delete row.
 
         Args:
             row_id: Row ID
+            user_id: User deleting the row
 
         Raises:
             NotFoundException: If row not found
+            ConflictException: If another reviewer holds the row
         """
         row = await self.row_repo.get_by_id(row_id)
 
         if not row:
             raise NotFoundException("Row not found")
 
-        await self.row_repo.delete(row_id)
+        deleted = await self.row_repo.bulk_delete([row_id], user_id)
+        await self._check_skipped_leases([row_id], deleted, user_id)
 
-    async def bulk_update_status(self, data: BulkUpdateStatusRequest) -> None:
+    async def bulk_update_status(self, data: BulkUpdateStatusRequest, user_id: UUID) -> None:
         """
         Bulk update row status.
 
         Args:
             data: Bulk update request
+            user_id: User updating the rows
+
+        Raises:
+            ConflictException: If another reviewer holds one of the rows
         """
-        await self.row_repo.bulk_update_status(data.row_ids, data.status.value)
+        updated = await self.row_repo.bulk_update_status(data.row_ids, data.status.value, user_id)
+        await self._check_skipped_leases(data.row_ids, updated, user_id)
 
-    async def bulk_delete(self, row_ids: list[UUID]) -> None:
+    async def bulk_delete(self, row_ids: list[UUID], user_id: UUID) -> None:
         """
         Bulk delete rows.
 
         Args:
             row_ids: List of row IDs
+            user_id: User deleting the rows
+
+        Raises:
+            ConflictException: If another reviewer holds one of the rows
+        """
+        deleted = await self.row_repo.bulk_delete(row_ids, user_id)
+        await self._check_skipped_leases(row_ids, deleted, user_id)
+
+    async def _check_skipped_leases(
+        self, row_ids: list[UUID], changed: set[UUID], user_id: UUID
+    ) -> None:
+        """
+        Check that no row was left unchanged because another reviewer holds it.
+
+        Raising rolls the request's transaction back, so a bulk change applies
+        to all of its rows or none. Rows that don't exist are ignored.
+
+        Args:
+            row_ids: Row IDs to change
+            changed: Row IDs changed
+            user_id: User making the change
+
+        Raises:
+            ConflictException: If another reviewer holds one of the rows
+        """
+        skipped = [row_id for row_id in row_ids if row_id not in changed]
+        if skipped and await self.row_repo.get_leased_by_others(skipped, user_id):
+            raise ConflictException("Some rows are being reviewed by another user")
+
+    async def review_session(
+        self, dataset_id: UUID, data: ReviewSessionRequest, reviewer_id: UUID
+    ) -> ReviewSessionResponse:
+        """
+        Apply review decisions and claim the next batch of pending rows.
+
+        Delivered rows are leased to the reviewer, so concurrent reviewers of
+        a dataset get disjoint rows; decisions on rows leased by someone else
+        are not applied and come back as conflicts. Approving or deleting a
+        row ends its lease, skipping releases it to other reviewers, and each
+        request renews the leases of rows still undecided.
+
+        The continuation token is a keyset cursor after the last delivered
+        row, so following batches neither re-count nor re-scan the rows
+        already delivered, and skipped rows are not delivered again.
+
+        Args:
+            dataset_id: Dataset ID
+            data: Decisions on delivered rows, batch size and continuation token
+            reviewer_id: Reviewer user ID
+
+        Returns:
+            Next rows, continuation token, pending rows left and conflicts
+
+        Raises:
+            ValidationException: If the continuation token is invalid
         """
-        await self.row_repo.bulk_delete(row_ids)
+        after = decode_cursor(data.continuation) if data.continuation else None
+
+        # The last decision on a row wins
+        decisions = {decision.row_id: decision for decision in data.decisions}
+        approvals = [
+            (d.row_id, d.data) for d in decisions.values() if d.action == ReviewAction.APPROVE
+        ]
+        deletions = [d.row_id for d in decisions.values() if d.action == ReviewAction.DELETE]
+        skips = [d.row_id for d in decisions.values() if d.action == ReviewAction.SKIP]
+
+        applied = await self.row_repo.approve_rows(dataset_id, approvals, reviewer_id)
+        applied |= await self.row_repo.delete_rows(dataset_id, deletions, reviewer_id)
+        conflicts = [row_id for row_id, _ in approvals if row_id not in applied]
+        conflicts += [row_id for row_id in deletions if row_id not in applied]
+
+        if data.release:
+            await self.row_repo.release_leases(dataset_id, reviewer_id)
+        else:
+            await self.row_repo.release_leases(dataset_id, reviewer_id, skips)
+            await self.row_repo.renew_leases(dataset_id, reviewer_id)
+
+        rows: list[DatasetRow] = []
+        continuation = data.continuation
+        if data.limit > 0 and not data.release:
+            rows = await self.row_repo.claim_pending_rows(
+                dataset_id, reviewer_id, data.limit, after
+            )
+            # A short batch can be due to rows other reviewers are claiming
+            # concurrently, so only an empty one ends the session
+            continuation = encode_cursor(rows[-1].updated_at, rows[-1].id) if rows else None
+
+        status_counts = await self.dataset_repo.get_status_counts([dataset_id])
+
+        return ReviewSessionResponse(
+            rows=self._to_responses(rows),
+            continuation=continuation,
+            pending_count=status_counts[dataset_id].get(RowStatus.PENDING.value, 0),
+            conflicts=conflicts,
+        )
 
     async def import_csv(
         self, dataset_id: UUID, data: CSVImportRequest, created_by: UUID
@@ -319,6 +767,38 @@ class RowService:
         Returns:
             Import summary
 
+        Raises:
+            NotFoundException: If dataset not found
+        """
+        # Parse CSV
+        csv_file = io.StringIO(data.file_content)
+        reader = DictReader(csv_file)
+
+        return await self.import_csv_stream(dataset_id, _iterate(reader), data, created_by)
+
+    async def import_csv_stream(
+        self,
+        dataset_id: UUID,
+        records: AsyncIterator[dict[str, str | None]],
+        options: CSVImportOptions,
+        created_by: UUID,
+    ) -> CSVImportResponse:
+        """
+        Import rows from a stream of CSV records.
+
+        Records are consumed in batches as they arrive. Images are fetched
+        concurrently (bounded overall and per host) a few batches ahead of the
+        batch being stored, so hashing overlaps database writes.
+
+        Args:
+            dataset_id: Dataset ID
+            records: CSV records keyed by column name
+            options: CSV import options
+            created_by: Creator user ID
+
+        Returns:
+            Import summary
+
         Raises:
             NotFoundException: If dataset not found
         """
@@ -331,92 +811,287 @@ class RowService:
         if not schema:
             raise NotFoundException("Schema not found")
 
-        # Parse CSV
-        csv_file = io.StringIO(data.file_content)
-        reader = DictReader(csv_file)
+        result = CSVImportResponse(imported=0, skipped_duplicates=0, skipped_invalid=0)
+        required_field_ids = [str(f.id) for f in schema.fields if f.required]
+        limiter = FetchLimiter(
+            settings.IMAGE_FETCH_CONCURRENCY, settings.IMAGE_FETCH_PER_HOST_CONCURRENCY
+        )
 
-        imported = 0
-        skipped_duplicates = 0
-        skipped_invalid = 0
-        errors: list[str] = []
+        staging_table = None
+        if options.mode == ImportMode.COPY:
+            staging_table = await self.row_repo.create_staging_table()
 
-        required_field_ids = [str(f.id) for f in schema.fields if f.required]
+        in_flight: deque[asyncio.Task[list[_ImportItem]]] = deque()
+        try:
+            async for batch in self._read_import_batches(records, options.column_mapping):
+                await self._apply_cached_hashes(batch)
+                in_flight.append(asyncio.create_task(self._hash_import_batch(batch, limiter)))
+                if len(in_flight) > settings.IMPORT_PREFETCH_BATCHES:
+                    items = await in_flight.popleft()
+                    await self._store_import_batch(
+                        dataset_id,
+                        items,
+                        options,
+                        required_field_ids,
+                        created_by,
+                        result,
+                        staging_table,
+                    )
+
+            while in_flight:
+                items = await in_flight.popleft()
+                await self._store_import_batch(
+                    dataset_id,
+                    items,
+                    options,
+                    required_field_ids,
+                    created_by,
+                    result,
+                    staging_table,
+                )
+        finally:
+            # Wait for cancelled fetches, so none outlives the request's client and session
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+        if staging_table is not None:
+            # Staged rows were counted as imported; the merge drops duplicates
+            merged = await self.row_repo.merge_staging(staging_table)
+            result.skipped_duplicates += result.imported - merged
+            result.imported = merged
+
+        result.errors = result.errors[:100]  # Limit errors to first 100
+        return result
+
+    async def _read_import_batches(
+        self, records: AsyncIterator[dict[str, str | None]], column_mapping: dict[str, str]
+    ) -> AsyncIterator[list[_ImportItem]]:
+        """
+        Map CSV records to import items, grouped into batches.
 
-        for idx, csv_row in enumerate(reader, start=2):  # Start at 2 to account for header
-            try:
-                # Extract image URL
-                image_url_column = data.column_mapping.get("image_url")
-                if not image_url_column or image_url_column not in csv_row:
-                    errors.append(f"Row {idx}: Missing image URL")
-                    skipped_invalid += 1
-                    continue
-
-                image_url = csv_row[image_url_column]
-
-                # Compute hash
-                try:
-                    image_hash = await self.compute_image_hash(image_url)
-                except Exception as e:
-                    errors.append(f"Row {idx}: Invalid image - {str(e)}")
-                    skipped_invalid += 1
-                    continue
-
-                # Check duplicate
-                if await self.row_repo.exists_by_image_hash(dataset_id, image_hash):
-                    skipped_duplicates += 1
-                    continue
+        Args:
+            records: CSV records keyed by column name
+            column_mapping: CSV column name -> field_id mapping
 
+        Yields:
+            Batches of import items
+        """
+        image_url_column = column_mapping.get("image_url")
+        batch: list[_ImportItem] = []
+        idx = 1  # Data starts on line 2, after the header
+
+        async for csv_row in records:
+            idx += 1
+            # Short rows map missing columns to None
+            image_url = csv_row.get(image_url_column) if image_url_column else None
+            if not image_url:
+                batch.append(_ImportItem(line=idx, error="Missing image URL"))
+            else:
                 # Map data
                 row_data = {}
-                for field_id, csv_column in data.column_mapping.items():
+                for field_id, csv_column in column_mapping.items():
                     if field_id != "image_url" and csv_column in csv_row:
                         row_data[field_id] = csv_row[csv_column]
 
-                # Calculate status
-                if data.mark_all_pending:
-                    status = "pending"
-                else:
-                    status = self.calculate_status(row_data, required_field_ids)
-
-                # Create row
-                row = DatasetRow(
-                    id=uuid4(),
-                    dataset_id=dataset_id,
-                    image_url=image_url,
-                    image_hash=image_hash,
-                    data=row_data,
-                    status=status,
-                    created_by=created_by,
-                    updated_by=created_by,
+                batch.append(_ImportItem(line=idx, image_url=image_url, data=row_data))
+
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    async def _apply_cached_hashes(self, items: list[_ImportItem]) -> None:
+        """
+        Look up a batch in the URL hash cache.
+
+        Fresh entries resolve the hash directly; with revalidation enabled they are
+        attached to the item so the download can be made conditional.
+
+        Args:
+            items: Import items
+        """
+        if not settings.IMAGE_HASH_CACHE_ENABLED:
+            return
+
+        entries = await self.hash_cache_repo.get_many(
+            [item.image_url for item in items if item.error is None and item.image_url],
+            settings.IMAGE_HASH_CACHE_TTL_SECONDS,
+        )
+
+        for item in items:
+            cached = entries.get(item.image_url)
+            if cached is None or item.error is not None:
+                continue
+
+            if settings.IMAGE_HASH_CACHE_REVALIDATE:
+                item.cached = cached
+            else:
+                item.image_hash = cached.image_hash
+
+    async def _hash_import_batch(
+        self, items: list[_ImportItem], limiter: FetchLimiter
+    ) -> list[_ImportItem]:
+        """
+        Compute image hashes for a batch concurrently.
+
+        Args:
+            items: Import items
+            limiter: Fetch concurrency limiter
+
+        Returns:
+            The same items, with image_hash or error set
+        """
+        # Fetch each distinct URL once
+        pending: dict[str, list[_ImportItem]] = {}
+        for item in items:
+            if item.error is None and item.image_hash is None:
+                pending.setdefault(item.image_url, []).append(item)
+
+        # Thumbnails are rendered while the fetch slot is held, so the downloaded
+        # content waiting for a worker stays bounded by the fetch concurrency
+        async def fetch(image_url: str, cached: ImageHashCache | None) -> _ImageFetch:
+            async with limiter.limit(image_url):
+                fetched = await self._download_image_hash(
+                    image_url, cached, keep_content=settings.THUMBNAILS_ON_IMPORT
                 )
+                await self._render_thumbnails(fetched)
+                return fetched
 
-                await self.row_repo.create(row)
-                imported += 1
+        outcomes = await asyncio.gather(
+            *(fetch(image_url, group[0].cached) for image_url, group in pending.items()),
+            return_exceptions=True,
+        )
 
-            except Exception as e:
-                errors.append(f"Row {idx}: {str(e)}")
-                skipped_invalid += 1
+        for group, outcome in zip(pending.values(), outcomes):
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
 
-        return CSVImportResponse(
-            imported=imported,
-            skipped_duplicates=skipped_duplicates,
-            skipped_invalid=skipped_invalid,
-            errors=errors[:100],  # Limit errors to first 100
+            for item in group:
+                if isinstance(outcome, Exception):
+                    item.error = f"Invalid image - {str(outcome)}"
+                else:
+                    item.fetched = outcome
+                    item.image_hash = outcome.image_hash
+
+        return items
+
+    async def _store_import_batch(
+        self,
+        dataset_id: UUID,
+        items: list[_ImportItem],
+        options: CSVImportOptions,
+        required_field_ids: list[str],
+        created_by: UUID,
+        result: CSVImportResponse,
+        staging_table: str | None = None,
+    ) -> None:
+        """
+        Store a hashed batch of import items and update the import summary.
+
+        Args:
+            dataset_id: Dataset ID
+            items: Hashed import items
+            options: CSV import options
+            required_field_ids: List of required field IDs
+            created_by: Creator user ID
+            result: Import summary to update
+            staging_table: Bulk load staging table (COPY mode)
+        """
+        await self._store_cached_hashes(
+            [item.fetched for item in items if item.fetched is not None]
         )
 
-    async def export_csv(self, dataset_id: UUID, only_reviewed: bool = True) -> str:
+        # Deduplicate in memory within the batch; earlier batches are already in the table
+        candidates: dict[str, _ImportItem] = {}
+        for item in items:
+            if item.error is not None:
+                result.errors.append(f"Row {item.line}: {item.error}")
+                result.skipped_invalid += 1
+            elif item.image_hash in candidates:
+                result.skipped_duplicates += 1
+            else:
+                candidates[item.image_hash] = item
+
+        # Check all hashes against the dataset with one query (COPY mode defers to the merge)
+        existing: set[str] = set()
+        if staging_table is None:
+            existing = await self.row_repo.get_existing_hashes(dataset_id, list(candidates))
+            result.skipped_duplicates += len(existing)
+
+        rows = []
+        for image_hash, item in candidates.items():
+            if image_hash in existing:
+                continue
+
+            # Calculate status
+            if options.mark_all_pending:
+                status = "pending"
+            else:
+                status = self.calculate_status(item.data, required_field_ids)
+
+            rows.append(
+                {
+                    "id": uuid4(),
+                    "dataset_id": dataset_id,
+                    "image_url": item.image_url,
+                    "image_hash": image_hash,
+                    "data": item.data,
+                    "status": status,
+                    "created_by": created_by,
+                    "updated_by": created_by,
+                }
+            )
+
+        if not rows:
+            return
+
+        if staging_table is not None:
+            await self.row_repo.copy_to_staging(staging_table, rows)
+            result.imported += len(rows)
+            return
+
+        # Insert survivors with one statement; a concurrent import may still win a race
+        try:
+            async with self.db.begin_nested():
+                inserted = await self.row_repo.insert_many(rows)
+        except Exception as e:
+            for row in rows:
+                result.errors.append(f"Row {candidates[row['image_hash']].line}: {str(e)}")
+            result.skipped_invalid += len(rows)
+            return
+
+        result.imported += len(inserted)
+        result.skipped_duplicates += len(rows) - len(inserted)
+
+    async def export_rows(
+        self,
+        dataset_id: UUID,
+        export_format: ExportFormat = ExportFormat.CSV,
+        status: RowStatus | None = RowStatus.REVIEWED,
+        columns: list[str] | None = None,
+    ) -> AsyncIterator[str | bytes]:
         """
-        Export dataset rows to CSV.
+        Export dataset rows.
+
+        The dataset, columns and format are validated up front; rows are then
+        read through a server-side cursor and emitted in chunks, so memory use
+        and time-to-first-byte do not depend on the dataset size.
 
         Args:
             dataset_id: Dataset ID
-            only_reviewed: Only export reviewed rows (default: True)
+            export_format: Output format
+            status: Only export rows with this status (None for all rows)
+            columns: Optional column names to export, in output order
 
         Returns:
-            CSV content as string
+            Async iterator of content chunks
 
         Raises:
             NotFoundException: If dataset not found
+            ValidationException: If a column is unknown or the format is unavailable
         """
         # Get dataset and schema
         dataset = await self.dataset_repo.get_by_id(dataset_id)
@@ -427,50 +1102,8 @@ class RowService:
         if not schema:
             raise NotFoundException("Schema not found")
 
-        # Get all rows (no pagination for export)
-        all_rows = []
-        page = 1
-        page_size = 100
-        status_filter = "reviewed" if only_reviewed else None
-
-        while True:
-            rows, total = await self.row_repo.get_by_dataset(dataset_id, page, page_size, status=status_filter)
-            all_rows.extend(rows)
-
-            if len(all_rows) >= total:
-                break
-
-            page += 1
-
-        # Build CSV
-        output = io.StringIO()
-
-        # Define columns: image_url + all schema fields + system fields
-        field_columns = {str(field.id): field.name for field in schema.fields}
-        columns = ["image_url"] + list(field_columns.values()) + ["status", "created_at", "updated_at", "updated_by"]
-
-        writer = DictWriter(output, fieldnames=columns)
-        writer.writeheader()
-
-        # Write rows
-        for row in all_rows:
-            csv_row = {"image_url": row.image_url}
-
-            # Add field data using field names
-            for field_id, field_name in field_columns.items():
-                csv_row[field_name] = row.data.get(field_id, "")
-
-            # Add system fields
-            csv_row["status"] = row.status
-            csv_row["created_at"] = row.created_at.isoformat() if row.created_at else ""
-            csv_row["updated_at"] = row.updated_at.isoformat() if row.updated_at else ""
-
-            # Add updated_by email
-            if row.updater:
-                csv_row["updated_by"] = row.updater.email
-            else:
-                csv_row["updated_by"] = ""
-
-            writer.writerow(csv_row)
+        export_columns = row_export.build_export_columns(schema.fields, columns)
+        row_export.check_format_available(export_format)
 
-        return output.getvalue()
+        rows = self.row_repo.stream_for_export(dataset_id, status.value if status else None)
+        return row_export.WRITERS[export_format](rows, export_columns)
@@ -0,0 +1,402 @@
+"""Row image thumbnails, resized in a process pool and cached on local disk."""
+
+import asyncio
+import contextlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from aitrace.common.exceptions import ValidationException
+from aitrace.common.settings import settings
+from aitrace.models.row import ThumbnailFormat
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    ThumbnailFormat.WEBP: "image/webp",
+    ThumbnailFormat.JPEG: "image/jpeg",
+}
+
+# Pillow format names and encoder options
+_ENCODERS: dict[ThumbnailFormat, tuple[str, dict[str, Any]]] = {
+    ThumbnailFormat.WEBP: ("WEBP", {"method": 4}),
+    ThumbnailFormat.JPEG: ("JPEG", {"optimize": True, "progressive": True}),
+}
+
+# Eviction deletes files until the cache is back under this fraction of its
+# limit, so that it does not rescan the directory on every following write
+_EVICTION_TARGET = 0.9
+
+Variants = dict[tuple[int, ThumbnailFormat], bytes]
+
+
+def _import_pil() -> Any:
+    """
+    Import Pillow, which is an optional dependency.
+
+    Returns:
+        The PIL.Image module
+
+    Raises:
+        ValidationException: If Pillow is not installed
+    """
+    try:
+        import PIL.Image
+    except ImportError as e:
+        raise ValidationException(
+            "Thumbnails are not available", details="Install the 'thumbnails' extra (Pillow)"
+        ) from e
+    return PIL.Image
+
+
+def check_available() -> None:
+    """
+    Check that the dependencies of thumbnail rendering are installed.
+
+    Raises:
+        ValidationException: If thumbnails cannot be rendered
+    """
+    _import_pil()
+
+
+def _render(
+    content: bytes, sizes: list[int], formats: list[str], quality: int
+) -> dict[tuple[int, str], bytes]:
+    """
+    Resize an image to every size and encode each size in every format.
+
+    Runs in a worker process, so arguments and results are plain values.
+
+    Args:
+        content: Source image content
+        sizes: Longest edge of each variant in pixels
+        formats: ThumbnailFormat values
+        quality: Encoder quality
+
+    Returns:
+        Encoded thumbnails by size and format value
+    """
+    from PIL import Image, ImageOps
+
+    largest = max(sizes)
+    variants = {}
+    with Image.open(io.BytesIO(content)) as source:
+        # JPEGs are decoded at the smallest scale that still covers the largest size
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+        # Largest first, each size resized from the previous one
+        for size in sorted(sizes, reverse=True):
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            for value in formats:
+                name, options = _ENCODERS[ThumbnailFormat(value)]
+                frame = image
+                if name == "JPEG" and has_alpha:
+                    frame = Image.new("RGB", image.size, (255, 255, 255))
+                    frame.paste(image, mask=image.getchannel("A"))
+
+                buffer = io.BytesIO()
+                frame.save(buffer, name, quality=quality, **options)
+                variants[(size, value)] = buffer.getvalue()
+
+    return variants
+
+
+class ThumbnailCache:
+    """
+    Thumbnail files on local disk, bounded in total size.
+
+    Files are named after the source image's hash, so rows sharing an image
+    share its thumbnails. Reads refresh a file's modification time; when a
+    write takes the cache over max_bytes, the least recently used files are
+    deleted. The size is tracked per process and recounted by each eviction,
+    so it is approximate when several processes share the directory.
+
+    Thread-safe. Methods block on disk I/O; call them through asyncio.to_thread.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            directory: Cache directory, created on first write
+            max_bytes: Maximum total size of the cached files
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size: int | None = None  # Counted on first write
+        self._lock = threading.Lock()
+
+    def path(self, image_hash: str, size: int, thumbnail_format: ThumbnailFormat) -> Path:
+        """
+        Get the file of a thumbnail.
+
+        Args:
+            image_hash: Source image hash
+            size: Longest edge in pixels
+            thumbnail_format: Thumbnail format
+
+        Returns:
+            File path
+        """
+        return self.directory / image_hash[:2] / f"{image_hash}_{size}.{thumbnail_format.value}"
+
+    def read(self, image_hash: str, size: int, thumbnail_format: ThumbnailFormat) -> bytes | None:
+        """
+        Read a cached thumbnail and mark it as recently used.
+
+        Args:
+            image_hash: Source image hash
+            size: Longest edge in pixels
+            thumbnail_format: Thumbnail format
+
+        Returns:
+            Thumbnail content, or None if not cached
+        """
+        path = self.path(image_hash, size, thumbnail_format)
+        try:
+            content = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return content
+
+    def contains(self, image_hash: str) -> bool:
+        """
+        Check whether every thumbnail variant of an image is cached.
+
+        Args:
+            image_hash: Source image hash
+
+        Returns:
+            True if all THUMBNAIL_SIZES are cached in every format
+        """
+        return all(
+            self.path(image_hash, size, thumbnail_format).exists()
+            for size in settings.THUMBNAIL_SIZES
+            for thumbnail_format in ThumbnailFormat
+        )
+
+    def write(self, image_hash: str, variants: Variants) -> None:
+        """
+        Cache the thumbnails of an image, evicting old files when over the limit.
+
+        Args:
+            image_hash: Source image hash
+            variants: Thumbnail content by size and format
+        """
+        written = 0
+        for (size, thumbnail_format), content in variants.items():
+            path = self.path(image_hash, size, thumbnail_format)
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Written aside and renamed, so readers never see a partial file
+            temporary = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temporary.write_bytes(content)
+            os.replace(temporary, path)
+            written += len(content)
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(file_size for _, file_size, _ in self._files())
+            else:
+                self._size += written
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _files(self) -> list[tuple[float, int, str]]:
+        """
+        List the cached files.
+
+        Returns:
+            Modification time, size and path of each file
+        """
+        files = []
+        if not self.directory.is_dir():
+            return files
+
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return files
+
+    def _evict(self) -> None:
+        """Delete the least recently used files until the cache is back under its limit."""
+        files = sorted(self._files())
+        total = sum(file_size for _, file_size, _ in files)
+        target = self.max_bytes * _EVICTION_TARGET
+
+        evicted = 0
+        for _, file_size, path in files:
+            if total <= target:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= file_size
+            evicted += 1
+
+        self._size = total
+        logger.info(f"Evicted {evicted} thumbnails, {total} bytes left in the cache")
+
+
+thumbnail_cache = ThumbnailCache(settings.THUMBNAIL_CACHE_DIR, settings.THUMBNAIL_CACHE_MAX_BYTES)
+
+# Resizing is CPU-bound and holds the GIL, so it runs in worker processes.
+# They are spawned rather than forked from the process running the event loop.
+_executor: ProcessPoolExecutor | None = None
+
+# Renders in progress by image hash, shared by concurrent requests for the same image
+_in_flight: dict[str, asyncio.Task[Variants]] = {}
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.THUMBNAIL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def render(image_hash: str, content: bytes) -> Variants:
+    """
+    Render every thumbnail variant of an image in the worker pool and cache them.
+
+    All THUMBNAIL_SIZES are rendered in both formats, so the source is decoded
+    once whichever variant was asked for.
+
+    Args:
+        image_hash: Source image hash
+        content: Source image content
+
+    Returns:
+        Thumbnail content by size and format
+
+    Raises:
+        ValidationException: If Pillow is not installed or the image cannot be decoded
+    """
+    global _executor
+    check_available()
+
+    loop = asyncio.get_running_loop()
+    try:
+        rendered = await loop.run_in_executor(
+            _get_executor(),
+            _render,
+            content,
+            settings.THUMBNAIL_SIZES,
+            [thumbnail_format.value for thumbnail_format in ThumbnailFormat],
+            settings.THUMBNAIL_QUALITY,
+        )
+    except BrokenProcessPool as e:
+        # A worker died (e.g. out of memory); the next render starts a new pool
+        _executor = None
+        raise ValidationException(f"Image could not be resized: {str(e)}")
+    except Exception as e:
+        raise ValidationException(f"Image could not be resized: {str(e)}")
+
+    variants = {
+        (size, ThumbnailFormat(value)): thumbnail for (size, value), thumbnail in rendered.items()
+    }
+    await asyncio.to_thread(thumbnail_cache.write, image_hash, variants)
+    return variants
+
+
+async def prerender(image_hash: str, image_url: str, content: bytes) -> None:
+    """
+    Render the thumbnails of an image downloaded for another purpose.
+
+    Failures are logged rather than raised; the image is then rendered on the
+    first request for one of its thumbnails.
+
+    Args:
+        image_hash: Source image hash
+        image_url: Source image URL
+        content: Source image content
+    """
+    if await asyncio.to_thread(thumbnail_cache.contains, image_hash):
+        return
+
+    try:
+        await render(image_hash, content)
+    except ValidationException as e:
+        logger.warning(f"Thumbnails of {image_url} not rendered: {e.message}")
+
+
+async def _load_and_render(image_hash: str, load: Callable[[], Awaitable[bytes]]) -> Variants:
+    return await render(image_hash, await load())
+
+
+def _forget(image_hash: str, task: asyncio.Task[Variants]) -> None:
+    _in_flight.pop(image_hash, None)
+    # Retrieve the outcome, in case every request waiting for it went away
+    if not task.cancelled():
+        task.exception()
+
+
+async def get_thumbnail(
+    image_hash: str,
+    size: int,
+    thumbnail_format: ThumbnailFormat,
+    load: Callable[[], Awaitable[bytes]],
+) -> bytes:
+    """
+    Get a thumbnail from the cache, rendering the image's variants on a miss.
+
+    Concurrent misses for the same image share one download and one render,
+    which completes even if the requests that started it are cancelled.
+
+    Args:
+        image_hash: Source image hash
+        size: Longest edge in pixels, one of THUMBNAIL_SIZES
+        thumbnail_format: Thumbnail format
+        load: Downloads the source image, called on a miss
+
+    Returns:
+        Thumbnail content
+
+    Raises:
+        ValidationException: If the image cannot be downloaded or resized
+    """
+    content = await asyncio.to_thread(thumbnail_cache.read, image_hash, size, thumbnail_format)
+    if content is not None:
+        return content
+
+    task = _in_flight.get(image_hash)
+    if task is None:
+        task = asyncio.create_task(_load_and_render(image_hash, load))
+        _in_flight[image_hash] = task
+        task.add_done_callback(partial(_forget, image_hash))
+
+    variants = await asyncio.shield(task)
+    return variants[(size, thumbnail_format)]
+
+
+def shutdown() -> None:
+    """Stop the worker pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
@@ -4,6 +4,7 @@ from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from aitrace.common.cache import user_cache
 from aitrace.common.exceptions import (
     DuplicateException,
     ForbiddenException,
@@ -89,7 +90,7 @@ class UserService:
         user = User(
             id=uuid4(),
             email=data.email.lower(),
-            password_hash=self.auth_service.hash_password(temp_password),
+            password_hash=await self.auth_service.hash_password(temp_password),
             role=data.role.value,
             team_id=team_id,
             must_reset_pwd=True,
@@ -125,6 +126,7 @@ class UserService:
             user.role = data.role.value
 
         user = await self.user_repo.update(user)
+        user_cache.invalidate_after_commit(user_id, self.db)
 
         return UserResponse.model_validate(user)
 
@@ -156,6 +158,7 @@ class UserService:
                 raise ForbiddenException("Cannot delete the last admin")
 
         await self.user_repo.delete(user_id)
+        user_cache.invalidate_after_commit(user_id, self.db)
 
     async def reset_user_password(self, user_id: UUID, admin_id: UUID) -> str:
         """
@@ -179,9 +182,10 @@ class UserService:
         # Generate temporary password
         temp_password = self.auth_service.generate_temp_password()
 
-        user.password_hash = self.auth_service.hash_password(temp_password)
+        user.password_hash = await self.auth_service.hash_password(temp_password)
         user.must_reset_pwd = True
 
         await self.user_repo.update(user)
+        user_cache.invalidate_after_commit(user_id, self.db)
 
         return temp_password
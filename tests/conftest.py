@@ -0,0 +1,118 @@
+"""Shared test fixtures.
+
+Tests that need PostgreSQL use the database at TEST_DATABASE_URL (e.g.
+postgresql+asyncpg://postgres@localhost:5432/aitrace_test), which is reset from
+database/schema.sql at the start of the run; they are skipped when it is not set.
+"""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from aitrace.common.http_client import http_client_wrapper
+from aitrace.models.dataset import Dataset
+from aitrace.models.schema import Schema, SchemaField
+from aitrace.models.team import Team
+from aitrace.models.user import User
+
+SCHEMA_SQL = Path(__file__).parents[1] / "database" / "schema.sql"
+
+
+async def _reset_database(url: str) -> None:
+    engine = create_async_engine(url, poolclass=NullPool)
+    async with engine.connect() as connection:
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.execute("DROP SCHEMA IF EXISTS aitrace CASCADE")
+        await raw.driver_connection.execute(SCHEMA_SQL.read_text())
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def database_url() -> str:
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    asyncio.run(_reset_database(url))
+    return url
+
+
+@pytest.fixture
+async def engine(database_url: str) -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    yield engine
+    async with engine.begin() as connection:
+        await connection.execute(text("TRUNCATE aitrace.teams, aitrace.image_hash_cache CASCADE"))
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine: AsyncEngine) -> Callable[[], AsyncSession]:
+    return lambda: AsyncSession(engine, expire_on_commit=False)
+
+
+@pytest.fixture
+async def db(session_factory: Callable[[], AsyncSession]) -> AsyncIterator[AsyncSession]:
+    async with session_factory() as session:
+        yield session
+
+
+@dataclass
+class DatasetFixture:
+    """A dataset whose schema has one required text field."""
+
+    id: UUID
+    team_id: UUID
+    user_id: UUID
+    field_id: str
+
+
+@pytest.fixture
+async def dataset(db: AsyncSession) -> DatasetFixture:
+    team = Team(id=uuid4(), name="Team")
+    user = User(
+        id=uuid4(), email=f"{uuid4()}@example.com", password_hash="x", role="admin", team=team
+    )
+    schema = Schema(id=uuid4(), name="Schema", team_id=team.id)
+    label = SchemaField(
+        id=uuid4(), schema_id=schema.id, name="label", type="text", required=True, position=0
+    )
+    dataset = Dataset(id=uuid4(), name="Dataset", schema_id=schema.id, team_id=team.id)
+    # Added in foreign key order, as only users relate to teams
+    for instance in (team, user, schema, label, dataset):
+        db.add(instance)
+        await db.flush()
+    await db.commit()
+    return DatasetFixture(id=dataset.id, team_id=team.id, user_id=user.id, field_id=str(label.id))
+
+
+@dataclass
+class ImageServer:
+    """Fake image host: https://images.test/<name> serves b"image <name>"; "missing" is a 404."""
+
+    requests: list[str] = field(default_factory=list)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(str(request.url))
+        name = request.url.path.lstrip("/")
+        if name == "missing":
+            return httpx.Response(404)
+        return httpx.Response(200, content=f"image {name}".encode())
+
+
+@pytest.fixture
+async def images() -> AsyncIterator[ImageServer]:
+    server = ImageServer()
+    previous = http_client_wrapper.client
+    http_client_wrapper.client = httpx.AsyncClient(transport=httpx.MockTransport(server.handle))
+    yield server
+    await http_client_wrapper.client.aclose()
+    http_client_wrapper.client = previous
@@ -0,0 +1,90 @@
+"""Tests for incremental CSV parsing."""
+
+import csv
+import io
+from collections.abc import AsyncIterator
+
+import pytest
+
+from aitrace.common.csv_stream import iter_csv_records
+from aitrace.common.exceptions import ValidationException
+
+
+async def _chunks(content: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(content), size):
+        yield content[start : start + size]
+
+
+async def _parse(content: str, size: int = 7) -> list[dict[str, str | None]]:
+    return [record async for record in iter_csv_records(_chunks(content.encode(), size))]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        'image_url,note\r\nhttp://x/a.jpg,"two\r\nlines"\r\nhttp://x/b.jpg,\r\n',
+        'image_url,note\nhttp://x/a.jpg,"say ""hi"", twice"\nhttp://x/b.jpg\n\n',
+    ],
+)
+async def test_matches_dict_reader(content: str) -> None:
+    expected = list(csv.DictReader(io.StringIO(content, newline="")))
+
+    assert await _parse(content) == expected
+
+
+async def test_stray_quote_in_unquoted_field() -> None:
+    content = 'image_url,note\nhttp://x/a.jpg,5" screen\nhttp://x/b.jpg,ok\n'
+
+    records = await _parse(content)
+
+    assert records == list(csv.DictReader(io.StringIO(content, newline="")))
+    assert [record["note"] for record in records] == ['5" screen', "ok"]
+
+
+async def test_unclosed_quote() -> None:
+    content = 'image_url,note\nhttp://x/a.jpg,"unclosed\nhttp://x/b.jpg,ok\n'
+
+    with pytest.raises(ValidationException):
+        await _parse(content)
+
+
+async def test_unclosed_quote_does_not_buffer_the_upload() -> None:
+    consumed = 0
+
+    async def chunks() -> AsyncIterator[bytes]:
+        nonlocal consumed
+        yield b'image_url,note\nhttp://x/a.jpg,"unclosed\n'
+        while True:
+            consumed += 1
+            yield b"http://x/b.jpg,ok\n" * 1000
+
+    with pytest.raises(ValidationException):
+        async for _ in iter_csv_records(chunks()):
+            pass
+
+    assert consumed * 18000 < 2 * csv.field_size_limit()
+
+
+async def test_rejects_non_utf8() -> None:
+    content = "image_url,note\nhttp://x/a.jpg,café\n".encode("latin-1")
+
+    with pytest.raises(ValidationException, match="UTF-8"):
+        async for _ in iter_csv_records(_chunks(content, 7)):
+            pass
+
+
+async def test_long_line_does_not_buffer_the_upload() -> None:
+    consumed = 0
+
+    async def chunks() -> AsyncIterator[bytes]:
+        nonlocal consumed
+        yield b"image_url,note\nhttp://x/a.jpg,"
+        while True:
+            consumed += 1
+            yield b"x" * 10000
+
+    with pytest.raises(ValidationException, match="too long"):
+        async for _ in iter_csv_records(chunks()):
+            pass
+
+    assert consumed * 10000 < 2 * csv.field_size_limit()
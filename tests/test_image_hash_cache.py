@@ -0,0 +1,76 @@
+"""Tests for the URL -> image hash cache."""
+
+import hashlib
+from collections.abc import Callable
+from datetime import timedelta
+
+from conftest import DatasetFixture, ImageServer
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aitrace.common.settings import settings
+from aitrace.models.image_hash_cache import ImageHashCache
+from aitrace.models.row import CSVImportRequest, DatasetRow
+from aitrace.repositories.image_hash_cache_repository import ImageHashCacheRepository
+from aitrace.services.row_service import RowService
+
+TTL = settings.IMAGE_HASH_CACHE_TTL_SECONDS
+
+
+def _entry(url: str) -> dict[str, str | None]:
+    return {"url": url, "image_hash": "0" * 32, "etag": None, "last_modified": None}
+
+
+def _request(*urls: str) -> CSVImportRequest:
+    return CSVImportRequest(
+        file_content="url\n" + "".join(f"{url}\n" for url in urls),
+        column_mapping={"image_url": "url"},
+    )
+
+
+async def test_hit_skips_download(
+    db: AsyncSession, dataset: DatasetFixture, images: ImageServer
+) -> None:
+    await ImageHashCacheRepository(db).upsert_many([_entry("https://images.test/a")])
+    await db.commit()
+
+    result = await RowService(db).import_csv(
+        dataset.id, _request("https://images.test/a"), dataset.user_id
+    )
+
+    assert result.imported == 1
+    assert images.requests == []
+    assert await db.scalar(select(DatasetRow.image_hash)) == "0" * 32
+
+
+async def test_miss_is_cached_in_its_own_transaction(
+    db: AsyncSession,
+    session_factory: Callable[[], AsyncSession],
+    dataset: DatasetFixture,
+    images: ImageServer,
+) -> None:
+    await RowService(db).import_csv(dataset.id, _request("https://images.test/a"), dataset.user_id)
+    await db.rollback()
+
+    async with session_factory() as other:
+        entries = await ImageHashCacheRepository(other).get_many(["https://images.test/a"], TTL)
+
+    assert images.requests == ["https://images.test/a"]
+    assert entries["https://images.test/a"].image_hash == hashlib.md5(b"image a").hexdigest()
+
+
+async def test_expired_entries_are_evicted(db: AsyncSession) -> None:
+    repo = ImageHashCacheRepository(db)
+    await repo.upsert_many([_entry("https://images.test/old"), _entry("https://images.test/new")])
+    await db.execute(
+        update(ImageHashCache)
+        .where(ImageHashCache.url == "https://images.test/old")
+        .values(fetched_at=func.now() - timedelta(seconds=TTL + 60))
+    )
+
+    assert list(await repo.get_many(["https://images.test/old"], TTL)) == []
+
+    await RowService(db).evict_expired_image_hashes()
+
+    remaining = await db.scalars(select(ImageHashCache.url))
+    assert remaining.all() == ["https://images.test/new"]
@@ -0,0 +1,65 @@
+"""Tests for the migration runner."""
+
+from pathlib import Path
+
+import pytest
+
+from aitrace.common.migrations import Migration, load_migrations, split_statements
+
+MIGRATIONS = Path(__file__).parents[1] / "database" / "migrations"
+
+
+def test_splits_on_top_level_semicolons() -> None:
+    sql = "CREATE TABLE a (id INT);\n\nCREATE TABLE b (id INT)\n"
+
+    assert split_statements(sql) == ["CREATE TABLE a (id INT)", "CREATE TABLE b (id INT)"]
+
+
+def test_keeps_semicolons_in_strings_and_identifiers() -> None:
+    sql = """INSERT INTO t VALUES ('a;b', 'it''s; fine');
+    CREATE TABLE "odd;name" (id INT);"""
+
+    assert split_statements(sql) == [
+        "INSERT INTO t VALUES ('a;b', 'it''s; fine')",
+        'CREATE TABLE "odd;name" (id INT)',
+    ]
+
+
+def test_keeps_dollar_quoted_bodies() -> None:
+    body = """CREATE FUNCTION f() RETURNS trigger AS $fn$
+BEGIN
+    PERFORM $$a; b$$;
+    RETURN NEW;
+END;
+$fn$ LANGUAGE plpgsql"""
+
+    assert split_statements(f"{body};\nSELECT $$;$$;") == [body, "SELECT $$;$$"]
+
+
+def test_keeps_comments_with_their_statement() -> None:
+    sql = """-- Leading comment; not a statement
+SELECT 1; /* block; comment */ SELECT 2;
+-- Trailing comment only
+"""
+
+    assert split_statements(sql) == [
+        "-- Leading comment; not a statement\nSELECT 1",
+        "/* block; comment */ SELECT 2",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("sql", "transactional"),
+    [
+        ("CREATE INDEX idx ON t (a);", True),
+        ("CREATE INDEX CONCURRENTLY idx ON t (a);", False),
+        ("-- migrate:no-transaction\nVACUUM t;", False),
+    ],
+)
+def test_transactional(sql: str, transactional: bool) -> None:
+    assert Migration("0001", "test", sql).transactional is transactional
+
+
+def test_shipped_migrations_split() -> None:
+    for migration in load_migrations(MIGRATIONS):
+        assert split_statements(migration.sql), migration.name
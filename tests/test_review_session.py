@@ -0,0 +1,153 @@
+"""Tests for review sessions."""
+
+from collections.abc import Callable
+from datetime import timedelta
+from uuid import UUID, uuid4
+
+from conftest import DatasetFixture
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aitrace.models.row import (
+    DatasetRow,
+    ReviewAction,
+    ReviewDecision,
+    ReviewSessionRequest,
+    ReviewSessionResponse,
+)
+from aitrace.models.user import User
+from aitrace.services.row_service import RowService
+
+
+async def _add_pending_rows(db: AsyncSession, dataset: DatasetFixture, count: int) -> None:
+    for i in range(count):
+        db.add(
+            DatasetRow(
+                dataset_id=dataset.id,
+                image_url=f"https://images.test/{i}",
+                image_hash=f"{i:032x}",
+                data={},
+                status="pending",
+            )
+        )
+    await db.commit()
+
+
+async def _review(
+    db: AsyncSession, dataset: DatasetFixture, reviewer_id: UUID, **request: object
+) -> ReviewSessionResponse:
+    response = await RowService(db).review_session(
+        dataset.id, ReviewSessionRequest.model_validate(request), reviewer_id
+    )
+    await db.commit()
+    return response
+
+
+async def test_applies_decisions(db: AsyncSession, dataset: DatasetFixture) -> None:
+    await _add_pending_rows(db, dataset, 4)
+    first = await _review(db, dataset, dataset.user_id, limit=3)
+    approved, deleted, skipped = (row.id for row in first.rows)
+
+    second = await _review(
+        db,
+        dataset,
+        dataset.user_id,
+        decisions=[
+            ReviewDecision(row_id=approved, action=ReviewAction.APPROVE, data={"label": "cat"}),
+            ReviewDecision(row_id=deleted, action=ReviewAction.DELETE),
+            ReviewDecision(row_id=skipped, action=ReviewAction.SKIP),
+        ],
+        limit=3,
+        continuation=first.continuation,
+    )
+
+    # Only the row never delivered is left after the cursor; skipped rows are not delivered again
+    assert len(second.rows) == 1
+    assert second.pending_count == 2
+    assert second.conflicts == []
+
+    stored = await db.scalars(select(DatasetRow).execution_options(populate_existing=True))
+    rows = {row.id: row for row in stored}
+    assert deleted not in rows
+    assert (rows[approved].status, rows[approved].data) == ("reviewed", {"label": "cat"})
+    assert rows[approved].leased_by is None
+    assert rows[skipped].leased_by is None
+
+    await _review(db, dataset, dataset.user_id, limit=0, release=True)
+
+    leased = await db.scalars(select(DatasetRow.id).where(DatasetRow.leased_by.is_not(None)))
+    assert leased.all() == []
+
+
+async def _add_reviewer(db: AsyncSession, dataset: DatasetFixture) -> UUID:
+    reviewer = User(
+        id=uuid4(),
+        email=f"{uuid4()}@example.com",
+        password_hash="x",
+        role="user",
+        team_id=dataset.team_id,
+    )
+    db.add(reviewer)
+    await db.commit()
+    return reviewer.id
+
+
+async def test_concurrent_reviewers_claim_disjoint_rows(
+    db: AsyncSession, session_factory: Callable[[], AsyncSession], dataset: DatasetFixture
+) -> None:
+    await _add_pending_rows(db, dataset, 5)
+    other_id = await _add_reviewer(db, dataset)
+
+    # Both claims run before either transaction commits
+    async with session_factory() as first_db, session_factory() as second_db:
+        request = ReviewSessionRequest(limit=3)
+        first = await RowService(first_db).review_session(dataset.id, request, dataset.user_id)
+        second = await RowService(second_db).review_session(dataset.id, request, other_id)
+        await first_db.commit()
+        await second_db.commit()
+
+    first_ids = {row.id for row in first.rows}
+    second_ids = {row.id for row in second.rows}
+    assert (len(first_ids), len(second_ids)) == (3, 2)
+    assert not first_ids & second_ids
+
+
+async def test_reclaims_expired_leases(db: AsyncSession, dataset: DatasetFixture) -> None:
+    await _add_pending_rows(db, dataset, 2)
+    other_id = await _add_reviewer(db, dataset)
+    claimed = await _review(db, dataset, dataset.user_id, limit=2)
+
+    assert (await _review(db, dataset, other_id, limit=2)).rows == []
+
+    await db.execute(update(DatasetRow).values(lease_expires_at=func.now() - timedelta(seconds=1)))
+    await db.commit()
+    reclaimed = await _review(db, dataset, other_id, limit=2)
+
+    assert {row.id for row in reclaimed.rows} == {row.id for row in claimed.rows}
+
+
+async def test_decisions_on_rows_leased_by_others_conflict(
+    db: AsyncSession, dataset: DatasetFixture
+) -> None:
+    await _add_pending_rows(db, dataset, 2)
+    other_id = await _add_reviewer(db, dataset)
+    approved, deleted = (row.id for row in (await _review(db, dataset, dataset.user_id)).rows)
+
+    response = await _review(
+        db,
+        dataset,
+        other_id,
+        decisions=[
+            ReviewDecision(row_id=approved, action=ReviewAction.APPROVE, data={"label": "cat"}),
+            ReviewDecision(row_id=deleted, action=ReviewAction.DELETE),
+        ],
+        limit=0,
+    )
+
+    assert response.conflicts == [approved, deleted]
+    assert response.pending_count == 2
+    stored = await db.scalars(select(DatasetRow).execution_options(populate_existing=True))
+    assert {(row.id, row.status, row.leased_by) for row in stored} == {
+        (approved, "pending", dataset.user_id),
+        (deleted, "pending", dataset.user_id),
+    }
@@ -0,0 +1,53 @@
+"""Tests for row export formats."""
+
+import io
+from collections.abc import AsyncIterator
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from aitrace.services.row_export import ColumnType, ExportColumn, coerce_value, write_parquet
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("42", 42),
+        (" -7 ", -7),
+        ("3.0", 3),
+        (3.5, None),
+        ("9007199254740993", 2**53 + 1),
+        (str(2**63 - 1), 2**63 - 1),
+        (str(-(2**63)), -(2**63)),
+        (str(2**63), None),
+        (-(2**63) - 1, None),
+        ("1e300", None),
+        ("inf", None),
+        ("forty-two", None),
+        (True, None),
+    ],
+)
+def test_coerce_integer(value: Any, expected: int | None) -> None:
+    assert coerce_value(value, ColumnType.INTEGER) == expected
+
+
+async def test_parquet_nulls_integers_out_of_range() -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    columns = [ExportColumn("count", ColumnType.INTEGER, "count")]
+
+    async def rows() -> AsyncIterator[Any]:
+        for count in ("1", str(2**63), str(2**64)):
+            yield SimpleNamespace(
+                data={"count": count},
+                image_url="https://images.test/a",
+                status="reviewed",
+                created_at=datetime(2024, 1, 1),
+                updated_at=datetime(2024, 1, 1),
+                updated_by_email=None,
+            )
+
+    content = b"".join([chunk async for chunk in write_parquet(rows(), columns)])
+
+    assert pq.read_table(io.BytesIO(content)).column("count").to_pylist() == [1, None, None]
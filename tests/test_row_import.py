@@ -0,0 +1,116 @@
+"""Tests for CSV row import."""
+
+from typing import Any
+
+import pytest
+from conftest import DatasetFixture, ImageServer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aitrace.common.settings import settings
+from aitrace.models.row import CSVImportRequest, CSVImportResponse, DatasetRow, ImportMode
+from aitrace.repositories.dataset_repository import DatasetRepository
+from aitrace.services.row_service import RowService
+
+
+async def _import(
+    db: AsyncSession, dataset: DatasetFixture, lines: list[str], **options: Any
+) -> CSVImportResponse:
+    request = CSVImportRequest(
+        file_content="url,label\n" + "".join(f"{line}\n" for line in lines),
+        column_mapping={"image_url": "url", dataset.field_id: "label"},
+        **options,
+    )
+    result = await RowService(db).import_csv(dataset.id, request, dataset.user_id)
+    await db.commit()
+    return result
+
+
+async def _stored(db: AsyncSession, dataset: DatasetFixture) -> dict[str, str]:
+    rows = await db.execute(
+        select(DatasetRow.image_url, DatasetRow.status).where(DatasetRow.dataset_id == dataset.id)
+    )
+    return {image_url: status for image_url, status in rows}
+
+
+@pytest.mark.parametrize("mode", list(ImportMode))
+async def test_reports_errors_per_row(
+    db: AsyncSession, dataset: DatasetFixture, images: ImageServer, mode: ImportMode
+) -> None:
+    result = await _import(
+        db,
+        dataset,
+        ["https://images.test/a,cat", "https://images.test/missing,dog", "https://images.test/b,"],
+        mode=mode,
+    )
+
+    assert (result.imported, result.skipped_duplicates, result.skipped_invalid) == (2, 0, 1)
+    assert len(result.errors) == 1
+    assert result.errors[0].startswith("Row 3: Invalid image - ")
+    assert await _stored(db, dataset) == {
+        "https://images.test/a": "reviewed",
+        "https://images.test/b": "pending",
+    }
+
+
+async def test_reports_missing_image_url(
+    db: AsyncSession, dataset: DatasetFixture, images: ImageServer
+) -> None:
+    # The URL column is last, so short rows leave it out
+    request = CSVImportRequest(
+        file_content="label,url\ncat,https://images.test/a\ndog\nbird,\n",
+        column_mapping={"image_url": "url", dataset.field_id: "label"},
+    )
+
+    result = await RowService(db).import_csv(dataset.id, request, dataset.user_id)
+
+    assert (result.imported, result.skipped_invalid) == (1, 2)
+    assert result.errors == ["Row 3: Missing image URL", "Row 4: Missing image URL"]
+
+
+@pytest.mark.parametrize("mode", list(ImportMode))
+async def test_skips_duplicates(
+    db: AsyncSession,
+    dataset: DatasetFixture,
+    images: ImageServer,
+    monkeypatch: pytest.MonkeyPatch,
+    mode: ImportMode,
+) -> None:
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    await _import(db, dataset, ["https://images.test/a,cat"], mode=mode)
+
+    # Copies of an image already in the dataset, in the same batch and in an earlier batch
+    result = await _import(
+        db,
+        dataset,
+        [
+            "https://images.test/a?copy,cat",
+            "https://images.test/b,dog",
+            "https://images.test/c,bird",
+            "https://images.test/c?copy,bird",
+            "https://images.test/b?copy,dog",
+        ],
+        mode=mode,
+    )
+
+    assert (result.imported, result.skipped_duplicates, result.skipped_invalid) == (2, 3, 0)
+    assert set(await _stored(db, dataset)) == {
+        "https://images.test/a",
+        "https://images.test/b",
+        "https://images.test/c",
+    }
+
+
+async def test_mark_all_pending(
+    db: AsyncSession, dataset: DatasetFixture, images: ImageServer
+) -> None:
+    result = await _import(
+        db,
+        dataset,
+        ["https://images.test/a,cat", "https://images.test/b,dog", "https://images.test/c,"],
+        mark_all_pending=True,
+    )
+
+    assert result.imported == 3
+    counts = await DatasetRepository(db).get_status_counts([dataset.id])
+    assert counts[dataset.id] == {"pending": 3}
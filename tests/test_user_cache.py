@@ -0,0 +1,23 @@
+"""Tests for the authenticated user cache."""
+
+from conftest import DatasetFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aitrace.common.cache import user_cache
+from aitrace.models.user import UserRole, UserUpdate
+from aitrace.services.user_service import UserService
+
+
+async def test_update_invalidates_after_commit(db: AsyncSession, dataset: DatasetFixture) -> None:
+    service = UserService(db)
+    user = await service.get_by_id(dataset.user_id)
+    user_cache.set(user.id, user)
+
+    await service.update(user.id, UserUpdate(role=UserRole.USER), user.id)
+
+    # Until the commit, other requests still read the old row
+    assert user_cache.get(user.id) is user
+
+    await db.commit()
+
+    assert user_cache.get(user.id) is None